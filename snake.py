@@ -1,6 +1,9 @@
 import pygame
-import random
 import sys
+from collections import deque
+
+from snake_sim import DOWN, LEFT, RIGHT, UP, SnakeSim
+from text_render import TextRenderer
 
 # Initialize pygame
 pygame.init()
@@ -10,8 +13,6 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 GRID_SIZE = 20
 CELL_SIZE = 20
-GRID_WIDTH = SCREEN_WIDTH // CELL_SIZE
-GRID_HEIGHT = SCREEN_HEIGHT // CELL_SIZE
 
 # Colors
 BLACK = (0, 0, 0)
@@ -21,70 +22,37 @@ RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 GRAY = (128, 128, 128)
 LIGHT_GREEN = (144, 238, 144)
+GRID_LINE = (20, 20, 20)
 
-# Directions
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+# Frames drawn per second; the snake itself moves self.speed times a second
+RENDER_FPS = 60
+# Turns remembered ahead of the snake, one used per move
+MAX_QUEUED_TURNS = 3
+
+class Snake(SnakeSim):
+    def draw_segment(self, screen, segment, head):
+        x = segment[0] * CELL_SIZE
+        y = segment[1] * CELL_SIZE
+        pygame.draw.rect(screen, GREEN if head else LIGHT_GREEN, (x, y, CELL_SIZE, CELL_SIZE))
+        # Draw border
+        pygame.draw.rect(screen, BLACK, (x, y, CELL_SIZE, CELL_SIZE), 1)
 
-class Snake:
-    def __init__(self):
-        self.body = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-        self.direction = RIGHT
-        self.grow = False
-        
-    def move(self):
-        head = self.body[0]
-        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
-        
-        # Check if snake hits the wall
-        if (new_head[0] < 0 or new_head[0] >= GRID_WIDTH or
-            new_head[1] < 0 or new_head[1] >= GRID_HEIGHT):
-            return False
-        
-        # Check if snake hits itself
-        if new_head in self.body:
-            return False
-        
-        self.body.insert(0, new_head)
-        
-        if not self.grow:
-            self.body.pop()
-        else:
-            self.grow = False
-            
-        return True
-    
-    def change_direction(self, new_direction):
-        # Prevent snake from going back into itself
-        if (new_direction[0] * -1, new_direction[1] * -1) != self.direction:
-            self.direction = new_direction
-    
-    def grow_snake(self):
-        self.grow = True
-    
     def draw(self, screen):
         for i, segment in enumerate(self.body):
-            x = segment[0] * CELL_SIZE
-            y = segment[1] * CELL_SIZE
-            
-            if i == 0:  # Head
-                pygame.draw.rect(screen, GREEN, (x, y, CELL_SIZE, CELL_SIZE))
-            else:  # Body
-                pygame.draw.rect(screen, LIGHT_GREEN, (x, y, CELL_SIZE, CELL_SIZE))
-            
-            # Draw border
-            pygame.draw.rect(screen, BLACK, (x, y, CELL_SIZE, CELL_SIZE), 1)
+            self.draw_segment(screen, segment, i == 0)
 
 class Food:
-    def __init__(self):
+    def __init__(self, snake):
         self.position = None
-        self.spawn()
+        self.spawn(snake)
     
-    def spawn(self):
-        self.position = (random.randint(0, GRID_WIDTH - 1), 
-                        random.randint(0, GRID_HEIGHT - 1))
+    def spawn(self, snake):
+        """Move to a random cell the snake is not on; position is None if there is none"""
+        index = snake.free.choice()
+        if index is None:
+            self.position = None
+        else:
+            self.position = (index % snake.width, index // snake.width)
     
     def draw(self, screen):
         x = self.position[0] * CELL_SIZE
@@ -97,22 +65,52 @@ class SnakeGame:
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Snake Game")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont('Arial', 36)
-        self.small_font = pygame.font.SysFont('Arial', 24)
+        self.font = TextRenderer('Arial', 36)
+        self.small_font = TextRenderer('Arial', 24)
         
         # Game state
         self.snake = Snake()
-        self.food = Food()
+        self.food = Food(self.snake)
         self.score = 0
         self.game_over = False
+        self.won = False
         self.running = True
         self.speed = 10  # Game speed (moves per second)
+
+        # Turns waiting for a move, time since the last move, and where the
+        # head and vacated tail came from so frames can slide between cells
+        self.turns = deque()
+        self.tick_time = 0
+        self.prev_head = None
+        self.prev_tail = None
+        self.motion_cells = set()
+
+        # Grid lines and the game-over shade never change, so draw them once
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.background.fill(BLACK)
+        for x in range(0, SCREEN_WIDTH, CELL_SIZE):
+            pygame.draw.line(self.background, GRID_LINE, (x, 0), (x, SCREEN_HEIGHT))
+        for y in range(0, SCREEN_HEIGHT, CELL_SIZE):
+            pygame.draw.line(self.background, GRID_LINE, (0, y), (SCREEN_WIDTH, y))
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.overlay.set_alpha(128)
+        self.overlay.fill(BLACK)
+
+        # Cells changed since the last frame; a full redraw repaints everything
+        self.dirty_cells = set()
+        self.full_redraw = True
+        self.score_rect = pygame.Rect(0, 0, 0, 0)
+        self.drawn_score = None
         
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
             
+            elif event.type == pygame.WINDOWEXPOSED:
+                # The window contents were lost, so repaint everything
+                self.full_redraw = True
+            
             elif event.type == pygame.KEYDOWN:
                 if self.game_over:
                     if event.key == pygame.K_SPACE:
@@ -122,92 +120,204 @@ class SnakeGame:
                 else:
                     # Arrow keys for movement
                     if event.key == pygame.K_UP:
-                        self.snake.change_direction(UP)
+                        self.queue_turn(UP)
                     elif event.key == pygame.K_DOWN:
-                        self.snake.change_direction(DOWN)
+                        self.queue_turn(DOWN)
                     elif event.key == pygame.K_LEFT:
-                        self.snake.change_direction(LEFT)
+                        self.queue_turn(LEFT)
                     elif event.key == pygame.K_RIGHT:
-                        self.snake.change_direction(RIGHT)
+                        self.queue_turn(RIGHT)
                     elif event.key == pygame.K_ESCAPE:
                         self.running = False
     
+    def queue_turn(self, direction):
+        """Remember a turn for a later move, so quick presses are not lost"""
+        last = self.turns[-1] if self.turns else self.snake.direction
+        # Turns that repeat or reverse the previous one would be ignored anyway
+        if direction == last or (-direction[0], -direction[1]) == last:
+            return
+        if len(self.turns) < MAX_QUEUED_TURNS:
+            self.turns.append(direction)
+    
     def update(self):
         if not self.game_over:
+            # One queued turn per move
+            if self.turns:
+                self.snake.change_direction(self.turns.popleft())
+            
+            # The old head and tail may change color or be vacated
+            old_head = self.snake.body[0]
+            old_tail = self.snake.body[-1]
+            self.dirty_cells.add(old_head)
+            self.dirty_cells.add(old_tail)
+            
             # Move snake
             if not self.snake.move():
                 self.game_over = True
+                self.full_redraw = True
+                self.prev_head = self.prev_tail = None
                 return
+            self.dirty_cells.add(self.snake.body[0])
+            self.prev_head = old_head
+            self.prev_tail = None if self.snake.occupies(old_tail) else old_tail
             
             # Check if snake ate food
             if self.snake.body[0] == self.food.position:
                 self.snake.grow_snake()
                 self.score += 10
                 
-                # Spawn new food (make sure it doesn't spawn on snake)
-                while True:
-                    self.food.spawn()
-                    if self.food.position not in self.snake.body:
-                        break
+                # Spawn new food on a free cell; with none left the snake fills the board
+                self.food.spawn(self.snake)
+                if self.food.position is None:
+                    self.won = True
+                    self.game_over = True
+                    self.full_redraw = True
+                    return
+                self.dirty_cells.add(self.food.position)
                 
                 # Increase speed slightly
                 self.speed = min(self.speed + 0.5, 20)
     
-    def draw(self):
-        self.screen.fill(BLACK)
+    def draw_cell(self, cell):
+        """Repaint one grid cell from the background, snake and food; returns its rect"""
+        rect = pygame.Rect(cell[0] * CELL_SIZE, cell[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        self.screen.blit(self.background, rect, rect)
+        head = self.snake.body[0]
+        if cell == head and self.prev_head is not None:
+            # The head is still sliding in; draw_motion draws it
+            pass
+        elif self.snake.occupies(cell):
+            self.snake.draw_segment(self.screen, cell, cell == head)
+        elif cell == self.food.position:
+            self.food.draw(self.screen)
+        return rect
+    
+    def draw_cells_in(self, area):
+        for x in range(area.left // CELL_SIZE, (area.right - 1) // CELL_SIZE + 1):
+            for y in range(area.top // CELL_SIZE, (area.bottom - 1) // CELL_SIZE + 1):
+                self.draw_cell((x, y))
+    
+    def draw_score(self):
+        """Repaint the score and the cells under it; returns the rect covered"""
+        area = self.score_rect
+        self.draw_cells_in(area)
+        rect = self.font.draw_number(self.screen, self.score, WHITE, prefix="Score: ", topleft=(10, 10))
+        if not area.contains(rect):
+            # The new score is wider, so clear under all of it and draw again
+            area = area.union(rect)
+            self.draw_cells_in(area)
+            self.font.draw_number(self.screen, self.score, WHITE, prefix="Score: ", topleft=(10, 10))
+        self.score_rect = rect
+        self.drawn_score = self.score
+        return area
+    
+    def draw_motion(self, alpha):
+        """Draw the head and vacated tail a fraction alpha of the way into their new cells"""
+        if self.prev_tail is not None:
+            old, new = self.prev_tail, self.snake.body[-1]
+            self.snake.draw_segment(self.screen, (old[0] + (new[0] - old[0]) * alpha,
+                                                  old[1] + (new[1] - old[1]) * alpha), False)
+        if self.prev_head is not None:
+            old, new = self.prev_head, self.snake.body[0]
+            self.snake.draw_segment(self.screen, (old[0] + (new[0] - old[0]) * alpha,
+                                                  old[1] + (new[1] - old[1]) * alpha), True)
+    
+    def draw(self, alpha=1.0):
+        """Redraw only the cells that changed since the last frame
+
+        alpha is how far the snake is through its current move, for drawing
+        the head and tail between cells.
+        """
+        # Cells the sliding head and tail cover now and covered last frame
+        motion_cells = {cell for cell in (self.prev_head, self.prev_tail) if cell is not None}
+        if motion_cells:
+            motion_cells.update((self.snake.body[0], self.snake.body[-1]))
         
-        # Draw grid (optional, for visual guidance)
-        for x in range(0, SCREEN_WIDTH, CELL_SIZE):
-            pygame.draw.line(self.screen, (20, 20, 20), (x, 0), (x, SCREEN_HEIGHT))
-        for y in range(0, SCREEN_HEIGHT, CELL_SIZE):
-            pygame.draw.line(self.screen, (20, 20, 20), (0, y), (SCREEN_WIDTH, y))
+        if self.full_redraw:
+            self.full_redraw = False
+            self.dirty_cells.clear()
+            self.motion_cells = motion_cells
+            self.draw_full(alpha)
+            pygame.display.flip()
+            return
+        
+        cells = self.dirty_cells | motion_cells | self.motion_cells
+        self.dirty_cells.clear()
+        self.motion_cells = motion_cells
+        if not cells:
+            return
+        dirty_rects = [self.draw_cell(cell) for cell in cells]
+        
+        # The score is drawn over the grid, so repaint it when it changes or a cell under it did
+        if self.score != self.drawn_score or self.score_rect.collidelist(dirty_rects) != -1:
+            dirty_rects.append(self.draw_score())
+        self.draw_motion(alpha)
+        pygame.display.update(dirty_rects)
+    
+    def draw_full(self, alpha=1.0):
+        self.screen.blit(self.background, (0, 0))
         
         # Draw game elements
         self.snake.draw(self.screen)
-        self.food.draw(self.screen)
+        if self.food.position is not None:
+            self.food.draw(self.screen)
+        if self.prev_head is not None:
+            self.draw_cell(self.snake.body[0])
         
         # Draw score
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (10, 10))
+        self.score_rect = self.font.draw_number(self.screen, self.score, WHITE, prefix="Score: ", topleft=(10, 10))
+        self.drawn_score = self.score
+        self.draw_motion(alpha)
         
         # Draw game over screen
         if self.game_over:
             # Semi-transparent overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(128)
-            overlay.fill(BLACK)
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.overlay, (0, 0))
             
             # Game over text
-            game_over_text = self.font.render("GAME OVER", True, RED)
-            text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-            self.screen.blit(game_over_text, text_rect)
+            if self.won:
+                self.font.draw(self.screen, "YOU WIN", GREEN, center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+            else:
+                self.font.draw(self.screen, "GAME OVER", RED, center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
             
             # Final score
-            score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
-            score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            self.screen.blit(score_text, score_rect)
+            self.font.draw_number(self.screen, self.score, WHITE, prefix="Final Score: ",
+                                  center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             
             # Instructions
-            restart_text = self.small_font.render("Press SPACE to play again or ESC to quit", True, WHITE)
-            restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-            self.screen.blit(restart_text, restart_rect)
-        
-        pygame.display.flip()
+            self.small_font.draw(self.screen, "Press SPACE to play again or ESC to quit", WHITE,
+                                 center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
     
     def reset_game(self):
         self.snake = Snake()
-        self.food = Food()
+        self.food = Food(self.snake)
         self.score = 0
         self.game_over = False
+        self.won = False
         self.speed = 10
+        self.full_redraw = True
+        self.turns.clear()
+        self.tick_time = 0
+        self.prev_head = self.prev_tail = None
     
     def run(self):
         while self.running:
+            # Poll input and draw at the display rate; move on a fixed timestep
+            dt = self.clock.tick(RENDER_FPS)
             self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(self.speed)
+            
+            alpha = 1.0
+            if not self.game_over:
+                # After a long stall, make at most one catch-up move
+                move_time = 1000 / self.speed
+                self.tick_time = min(self.tick_time + dt, 2 * move_time)
+                while self.tick_time >= move_time and not self.game_over:
+                    self.tick_time -= move_time
+                    self.update()
+                    move_time = 1000 / self.speed
+                alpha = min(self.tick_time / move_time, 1.0)
+            
+            self.draw(alpha)
         
         pygame.quit()
 
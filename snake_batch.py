@@ -0,0 +1,189 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from snake_sim import DOWN, GRID_HEIGHT, GRID_WIDTH, LEFT, RIGHT, UP
+
+# Actions: keep going, or turn with SnakeSim.change_direction rules
+NOOP = 0
+TURN_UP = 1
+TURN_DOWN = 2
+TURN_LEFT = 3
+TURN_RIGHT = 4
+ACTIONS = (NOOP, TURN_UP, TURN_DOWN, TURN_LEFT, TURN_RIGHT)
+
+# DIRECTIONS[action - 1] = (dx, dy); OPPOSITE[d] is the reverse of direction d
+DIRECTIONS = np.array([UP, DOWN, LEFT, RIGHT], dtype=np.int32)
+OPPOSITE = np.array([DIRECTIONS.tolist().index([-dx, -dy]) for dx, dy in DIRECTIONS.tolist()], dtype=np.int8)
+START_DIRECTION = DIRECTIONS.tolist().index(list(RIGHT))
+
+# Points for eating, as in SnakeGame
+FOOD_SCORE = 10
+
+# Random cells tried before food placement falls back to a full scan of the board
+FOOD_TRIES = 8
+
+# Values in observe()
+EMPTY, BODY, HEAD, FOOD = 0, 1, 2, 3
+
+
+class SnakeBatchEnv:
+    """N Snake games stepped in lockstep on NumPy arrays
+
+    Follows the SnakeSim rules: a turn straight back is ignored, the snake
+    dies on walls or its own body, the head may move into the tail's cell
+    unless the snake is growing, and eating grows the snake on its next
+    move. Each body is a ring buffer of cell indices next to an occupancy
+    grid, so a step costs the same however long the snakes are. Finished
+    games (deaths and full boards) are reset automatically.
+    """
+
+    def __init__(self, num_envs, width=GRID_WIDTH, height=GRID_HEIGHT, seed=None):
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.cell_count = width * height
+        self.rng = np.random.default_rng(seed)
+        self.index = np.arange(num_envs)
+
+        self.occupied = np.zeros((num_envs, self.cell_count), dtype=bool)
+        # body[env, head_slot] is the head; the previous length - 1 slots hold the rest
+        self.body = np.zeros((num_envs, self.cell_count), dtype=np.int32)
+        self.head_slot = np.zeros(num_envs, dtype=np.int32)
+        self.length = np.zeros(num_envs, dtype=np.int32)
+        self.head_x = np.zeros(num_envs, dtype=np.int32)
+        self.head_y = np.zeros(num_envs, dtype=np.int32)
+        self.direction = np.zeros(num_envs, dtype=np.int8)
+        self.grow = np.zeros(num_envs, dtype=bool)
+        self.food = np.zeros(num_envs, dtype=np.int32)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        # Final score of the last finished game on each board
+        self.last_score = np.zeros(num_envs, dtype=np.int64)
+
+        self.reset(np.ones(num_envs, dtype=bool))
+
+    def spawn_food(self, mask):
+        """Put food on a random free cell of the masked boards; returns the boards with none free"""
+        pending = mask.copy()
+        for _ in range(FOOD_TRIES):
+            if not pending.any():
+                return pending
+            boards = np.flatnonzero(pending)
+            cells = self.rng.integers(0, self.cell_count, size=len(boards))
+            free = ~self.occupied[boards, cells]
+            self.food[boards[free]] = cells[free]
+            pending[boards[free]] = False
+
+        # Nearly full boards: pick uniformly among the free cells directly
+        boards = np.flatnonzero(pending)
+        if len(boards):
+            keys = self.rng.random((len(boards), self.cell_count))
+            keys[self.occupied[boards]] = -1
+            cells = keys.argmax(axis=1)
+            self.food[boards] = cells
+            pending[boards] = self.occupied[boards, cells]
+        return pending
+
+    def reset(self, mask):
+        """Start new games on the masked boards"""
+        self.last_score[mask] = self.score[mask]
+        self.score[mask] = 0
+        self.occupied[mask] = False
+
+        x = self.width // 2
+        y = self.height // 2
+        self.head_x[mask] = x
+        self.head_y[mask] = y
+        self.head_slot[mask] = 0
+        self.body[mask, 0] = y * self.width + x
+        self.occupied[mask, y * self.width + x] = True
+        self.length[mask] = 1
+        self.direction[mask] = START_DIRECTION
+        self.grow[mask] = False
+        self.spawn_food(mask)
+
+    def observe(self):
+        """Boards as uint8 (N, height, width) grids of EMPTY, BODY, HEAD and FOOD"""
+        obs = self.occupied.astype(np.uint8)
+        obs[self.index, self.food] = FOOD
+        obs[self.index, self.head_y * self.width + self.head_x] = HEAD
+        return obs.reshape(self.num_envs, self.height, self.width)
+
+    def step(self, actions):
+        """Apply one action per board and move every snake; returns (obs, rewards, dones)"""
+        actions = np.asarray(actions)
+
+        # Turn unless the new direction is straight back
+        turning = actions != NOOP
+        wanted = (actions - 1).astype(np.int8)
+        turning &= wanted != OPPOSITE[self.direction]
+        self.direction[turning] = wanted[turning]
+
+        step = DIRECTIONS[self.direction]
+        x = self.head_x + step[:, 0]
+        y = self.head_y + step[:, 1]
+        wall = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        cell = np.clip(y, 0, self.height - 1) * self.width + np.clip(x, 0, self.width - 1)
+
+        # The tail moves out of the way first unless the snake is growing
+        tail_slot = (self.head_slot - self.length + 1) % self.cell_count
+        tail = self.body[self.index, tail_slot]
+        hit = self.occupied[self.index, cell] & (self.grow | (cell != tail))
+        alive = ~(wall | hit)
+
+        shrinking = alive & ~self.grow
+        self.occupied[self.index[shrinking], tail[shrinking]] = False
+        growing = alive & self.grow
+        self.length[growing] += 1
+        self.grow[growing] = False
+
+        self.head_slot[alive] = (self.head_slot[alive] + 1) % self.cell_count
+        self.body[self.index[alive], self.head_slot[alive]] = cell[alive]
+        self.occupied[self.index[alive], cell[alive]] = True
+        self.head_x[alive] = x[alive]
+        self.head_y[alive] = y[alive]
+
+        # Eating grows the snake on its next move
+        ate = alive & (cell == self.food)
+        self.grow[ate] = True
+        rewards = np.where(ate, FOOD_SCORE, 0)
+        self.score += rewards
+        won = self.spawn_food(ate)
+
+        dones = ~alive | won
+        if dones.any():
+            self.reset(dones)
+
+        return self.observe(), rewards, dones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the batched Snake environment with random play")
+    parser.add_argument("steps", type=int, help="number of batched steps")
+    parser.add_argument("-n", "--num-envs", type=int, default=4096, help="boards stepped together")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+
+    env = SnakeBatchEnv(args.num_envs, seed=args.seed)
+    rng = np.random.default_rng(args.seed)
+    games = 0
+    start = time.perf_counter()
+
+    for _ in range(args.steps):
+        _, _, dones = env.step(rng.choice(ACTIONS, size=args.num_envs))
+        games += int(dones.sum())
+
+    elapsed = time.perf_counter() - start
+    total = args.steps * args.num_envs
+    print(f"Simulated {total} snake steps ({games} finished games) in {elapsed:.2f}s "
+          f"({total / elapsed:.0f} snake steps/sec)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,111 @@
+import random
+from collections import deque
+
+# Board size in cells
+GRID_WIDTH = 40
+GRID_HEIGHT = 30
+
+# Directions
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+
+class FreeCells:
+    """Set of free cell indices with O(1) add, remove and random pick
+
+    cells[:count] holds the free indices in any order and slots maps each
+    index to its position in cells, so removing swaps the last free index
+    into the gap.
+    """
+
+    def __init__(self, size):
+        self.cells = list(range(size))
+        self.slots = list(range(size))
+        self.count = size
+
+    def __len__(self):
+        return self.count
+
+    def remove(self, index):
+        slot = self.slots[index]
+        last = self.cells[self.count - 1]
+        self.cells[slot] = last
+        self.slots[last] = slot
+        self.cells[self.count - 1] = index
+        self.slots[index] = self.count - 1
+        self.count -= 1
+
+    def add(self, index):
+        slot = self.slots[index]
+        first_taken = self.cells[self.count]
+        self.cells[slot] = first_taken
+        self.slots[first_taken] = slot
+        self.cells[self.count] = index
+        self.slots[index] = self.count
+        self.count += 1
+
+    def choice(self):
+        """Random free index, or None when every cell is taken"""
+        if not self.count:
+            return None
+        return self.cells[random.randrange(self.count)]
+
+
+class SnakeSim:
+    """Snake body and movement rules with no display"""
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.width = width
+        self.height = height
+        start = (width // 2, height // 2)
+        # Head first; occupied has one byte per cell, set where a segment is
+        self.body = deque([start])
+        self.occupied = bytearray(width * height)
+        self.occupied[start[1] * width + start[0]] = 1
+        self.free = FreeCells(width * height)
+        self.free.remove(start[1] * width + start[0])
+        self.direction = RIGHT
+        self.grow = False
+        
+    def occupies(self, position):
+        """Check if any segment is on a cell"""
+        return self.occupied[position[1] * self.width + position[0]] == 1
+
+    def move(self):
+        head = self.body[0]
+        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
+        
+        # Check if snake hits the wall
+        if (new_head[0] < 0 or new_head[0] >= self.width or
+            new_head[1] < 0 or new_head[1] >= self.height):
+            return False
+        
+        # Check if snake hits itself; the tail moves away this turn unless
+        # the snake is growing, so the head may take its cell
+        index = new_head[1] * self.width + new_head[0]
+        tail = self.body[-1]
+        if self.occupied[index] and (self.grow or new_head != tail):
+            return False
+        
+        if not self.grow:
+            self.body.pop()
+            tail_index = tail[1] * self.width + tail[0]
+            self.occupied[tail_index] = 0
+            self.free.add(tail_index)
+        else:
+            self.grow = False
+        
+        self.body.appendleft(new_head)
+        self.occupied[index] = 1
+        self.free.remove(index)
+        return True
+    
+    def change_direction(self, new_direction):
+        # Prevent snake from going back into itself
+        if (new_direction[0] * -1, new_direction[1] * -1) != self.direction:
+            self.direction = new_direction
+    
+    def grow_snake(self):
+        self.grow = True
@@ -1,8 +1,11 @@
 import pygame
-import random
 import sys
 import copy
 
+from sudoku_bank import open_bank
+from sudoku_generator import PuzzlePrefetcher, generate_puzzle
+from text_render import TextRenderer
+
 # Initialize pygame
 pygame.init()
 
@@ -25,13 +28,59 @@ GREEN = (0, 255, 0)
 SELECTED_COLOR = (173, 216, 230)
 CONFLICT_COLOR = (255, 200, 200)
 
+# Longest time the event-driven loop sleeps waiting for input (milliseconds)
+IDLE_TIMEOUT = 1000
+
+class ConflictTracker:
+    """Per-row, per-column and per-box digit counters kept in step with the board"""
+    def __init__(self, board, solution):
+        self.solution = solution
+        self.rows = [[0] * (GRID_SIZE + 1) for _ in range(GRID_SIZE)]
+        self.cols = [[0] * (GRID_SIZE + 1) for _ in range(GRID_SIZE)]
+        self.boxes = [[0] * (GRID_SIZE + 1) for _ in range(GRID_SIZE)]
+        
+        # Every cell starts out empty, so every cell starts out wrong
+        self.wrong_cells = GRID_SIZE * GRID_SIZE
+        for row in range(GRID_SIZE):
+            for col in range(GRID_SIZE):
+                self.update(row, col, 0, board[row][col])
+    
+    def update(self, row, col, old, new):
+        """Record that the cell at (row, col) changed from old to new"""
+        box = (row // 3) * 3 + col // 3
+        if old:
+            self.rows[row][old] -= 1
+            self.cols[col][old] -= 1
+            self.boxes[box][old] -= 1
+        if new:
+            self.rows[row][new] += 1
+            self.cols[col][new] += 1
+            self.boxes[box][new] += 1
+        
+        expected = self.solution[row][col]
+        self.wrong_cells += (new != expected) - (old != expected)
+    
+    def is_conflict(self, row, col, num, current):
+        """Check if num at (row, col) clashes with another cell; current is the cell's value"""
+        if num == 0:
+            return False
+        
+        # The cell's own value is part of the counts
+        own = 1 if current == num else 0
+        box = (row // 3) * 3 + col // 3
+        return (self.rows[row][num] > own or self.cols[col][num] > own or
+                self.boxes[box][num] > own)
+    
+    def is_solved(self):
+        return self.wrong_cells == 0
+
 class Sudoku:
-    def __init__(self):
+    def __init__(self, event_driven=True):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Sudoku")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont('Arial', 30)
-        self.small_font = pygame.font.SysFont('Arial', 20)
+        self.font = TextRenderer('Arial', 30)
+        self.small_font = TextRenderer('Arial', 20)
         
         # Game state
         self.board = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
@@ -41,95 +90,50 @@ class Sudoku:
         self.game_over = False
         self.difficulty = "medium"  # easy, medium, hard
         
+        # Pre-generated puzzles, or None to always generate live
+        self.bank = open_bank()
+        
+        # Ready puzzles for every difficulty, refilled in the background
+        self.prefetcher = PuzzlePrefetcher(self.load_puzzle)
+        
+        # Cached static layer and last drawn state of each cell
+        self.background = None
+        self.background_key = None
+        self.cell_states = {}
+        self.needs_redraw = True
+        
+        # Sleep until input arrives instead of polling at a fixed frame rate
+        self.event_driven = event_driven
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        
         # Start new game
         self.new_game()
+        self.build_background()
     
     def new_game(self):
         """Generate a new Sudoku puzzle"""
-        # Generate a complete valid Sudoku solution
-        self.generate_complete_board()
-        
-        # Copy the solution
-        self.solution = copy.deepcopy(self.board)
-        
-        # Remove numbers based on difficulty
-        cells_to_remove = {
-            "easy": 30,
-            "medium": 40,
-            "hard": 50
-        }.get(self.difficulty, 40)
-        
-        self.remove_numbers(cells_to_remove)
+        self.board, self.solution = self.prefetcher.get(self.difficulty)
         
         # Store the initial board state
         self.initial_board = copy.deepcopy(self.board)
+        self.tracker = ConflictTracker(self.board, self.solution)
         
         # Reset game state
         self.selected_cell = None
         self.game_over = False
     
-    def generate_complete_board(self):
-        """Generate a complete valid Sudoku board using backtracking"""
-        # Fill diagonal 3x3 boxes first (they don't affect each other)
-        for box in range(0, GRID_SIZE, 3):
-            self.fill_box(box, box)
-        
-        # Fill remaining cells using backtracking
-        self.solve_board()
+    def load_puzzle(self, difficulty):
+        """Take a puzzle from the bank, falling back to live generation"""
+        puzzle = self.bank.random_puzzle(difficulty) if self.bank else None
+        if puzzle is None:
+            puzzle = generate_puzzle(difficulty)
+        return puzzle
     
-    def fill_box(self, row, col):
-        """Fill a 3x3 box with random numbers 1-9"""
-        nums = list(range(1, 10))
-        random.shuffle(nums)
-        
-        for i in range(3):
-            for j in range(3):
-                self.board[row + i][col + j] = nums[i * 3 + j]
-    
-    def is_valid(self, num, row, col):
-        """Check if placing num at (row, col) is valid"""
-        # Check row
-        for x in range(GRID_SIZE):
-            if self.board[row][x] == num:
-                return False
-        
-        # Check column
-        for x in range(GRID_SIZE):
-            if self.board[x][col] == num:
-                return False
-        
-        # Check 3x3 box
-        start_row = row - row % 3
-        start_col = col - col % 3
-        for i in range(3):
-            for j in range(3):
-                if self.board[i + start_row][j + start_col] == num:
-                    return False
-        
-        return True
-    
-    def solve_board(self):
-        """Solve the Sudoku board using backtracking"""
-        for i in range(GRID_SIZE):
-            for j in range(GRID_SIZE):
-                if self.board[i][j] == 0:
-                    for num in range(1, 10):
-                        if self.is_valid(num, i, j):
-                            self.board[i][j] = num
-                            if self.solve_board():
-                                return True
-                            self.board[i][j] = 0
-                    return False
-        return True
-    
-    def remove_numbers(self, count):
-        """Remove 'count' numbers from the board to create a puzzle"""
-        cells = [(i, j) for i in range(GRID_SIZE) for j in range(GRID_SIZE)]
-        random.shuffle(cells)
-        
-        for i in range(count):
-            row, col = cells[i]
-            self.board[row][col] = 0
+    def set_cell(self, row, col, num):
+        """Change a cell and keep the conflict counters up to date"""
+        self.tracker.update(row, col, self.board[row][col], num)
+        self.board[row][col] = num
     
     def get_cell_from_pos(self, pos):
         """Get cell coordinates from mouse position"""
@@ -148,68 +152,58 @@ class Sudoku:
     
     def is_conflict(self, row, col, num):
         """Check if placing num at (row, col) would create a conflict"""
-        if num == 0:
-            return False
-            
-        # Temporarily place the number
-        original_value = self.board[row][col]
-        self.board[row][col] = 0
-        
-        # Check if the number is valid in this position
-        is_conflict = not self.is_valid(num, row, col)
-        
-        # Restore the original value
-        self.board[row][col] = original_value
-        
-        return is_conflict
+        return self.tracker.is_conflict(row, col, num, self.board[row][col])
     
     def is_game_over(self):
         """Check if the game is over (board is complete and valid)"""
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                value = self.board[row][col]
-                if value == 0 or value != self.solution[row][col]:
-                    return False
-        return True
+        return self.tracker.is_solved()
     
-    def draw_grid(self):
-        """Draw the Sudoku grid"""
-        # Draw cells
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                x = GRID_X_OFFSET + col * CELL_SIZE
-                y = GRID_Y_OFFSET + row * CELL_SIZE
-                
-                # Determine cell color
-                if self.selected_cell == (row, col):
-                    cell_color = SELECTED_COLOR
-                elif self.selected_cell and self.is_conflict(row, col, self.board[row][col]):
-                    cell_color = CONFLICT_COLOR
-                else:
-                    cell_color = WHITE
-                
-                # Draw cell
-                cell_rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-                pygame.draw.rect(self.screen, cell_color, cell_rect)
-                
-                # Draw number if not empty
-                if self.board[row][col] != 0:
-                    # Determine text color
-                    if self.initial_board[row][col] != 0:
-                        text_color = BLACK
-                    elif self.is_conflict(row, col, self.board[row][col]):
-                        text_color = RED
-                    else:
-                        text_color = BLUE
-                    
-                    text = self.font.render(str(self.board[row][col]), True, text_color)
-                    text_rect = text.get_rect(center=(x + CELL_SIZE // 2, y + CELL_SIZE // 2))
-                    self.screen.blit(text, text_rect)
-                
-                # Draw cell border
-                pygame.draw.rect(self.screen, GRAY, cell_rect, 1)
+    def get_cell_state(self, row, col):
+        """Return the (value, cell color, text color) a cell should be drawn with"""
+        value = self.board[row][col]
+        
+        # Determine cell color
+        if self.selected_cell == (row, col):
+            cell_color = SELECTED_COLOR
+        elif self.selected_cell and self.is_conflict(row, col, value):
+            cell_color = CONFLICT_COLOR
+        else:
+            cell_color = WHITE
+        
+        # Determine text color
+        if value == 0:
+            text_color = None
+        elif self.initial_board[row][col] != 0:
+            text_color = BLACK
+        elif self.is_conflict(row, col, value):
+            text_color = RED
+        else:
+            text_color = BLUE
+        
+        return value, cell_color, text_color
+    
+    def draw_cell(self, row, col, state):
+        """Draw one cell and return its screen rect"""
+        value, cell_color, text_color = state
+        x = GRID_X_OFFSET + col * CELL_SIZE
+        y = GRID_Y_OFFSET + row * CELL_SIZE
+        
+        # Draw cell
+        cell_rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
+        pygame.draw.rect(self.screen, cell_color, cell_rect)
+        
+        # Draw number if not empty
+        if value != 0:
+            self.font.draw(self.screen, str(value), text_color,
+                           center=(x + CELL_SIZE // 2, y + CELL_SIZE // 2))
+        
+        # Draw cell border
+        pygame.draw.rect(self.screen, GRAY, cell_rect, 1)
         
-        # Draw thick borders for 3x3 boxes
+        return cell_rect
+    
+    def draw_box_lines(self):
+        """Draw thick borders for 3x3 boxes"""
         for i in range(0, GRID_SIZE + 1, 3):
             # Horizontal lines
             pygame.draw.line(
@@ -226,17 +220,15 @@ class Sudoku:
                 3
             )
     
-    def draw_buttons(self):
+    def draw_buttons(self, surface):
         """Draw control buttons"""
         button_y = GRID_Y_OFFSET + GRID_SIZE * CELL_SIZE + 30
         
         # New Game button
         new_game_rect = pygame.Rect(GRID_X_OFFSET, button_y, 120, 40)
-        pygame.draw.rect(self.screen, LIGHT_GRAY, new_game_rect)
-        pygame.draw.rect(self.screen, BLACK, new_game_rect, 2)
-        new_game_text = self.small_font.render("New Game", True, BLACK)
-        text_rect = new_game_text.get_rect(center=new_game_rect.center)
-        self.screen.blit(new_game_text, text_rect)
+        pygame.draw.rect(surface, LIGHT_GRAY, new_game_rect)
+        pygame.draw.rect(surface, BLACK, new_game_rect, 2)
+        self.small_font.draw(surface, "New Game", BLACK, center=new_game_rect.center)
         
         # Difficulty buttons
         diff_x = GRID_X_OFFSET + 140
@@ -245,48 +237,89 @@ class Sudoku:
             
             # Highlight current difficulty
             if difficulty == self.difficulty:
-                pygame.draw.rect(self.screen, GREEN, diff_rect)
+                pygame.draw.rect(surface, GREEN, diff_rect)
             else:
-                pygame.draw.rect(self.screen, LIGHT_GRAY, diff_rect)
+                pygame.draw.rect(surface, LIGHT_GRAY, diff_rect)
             
-            pygame.draw.rect(self.screen, BLACK, diff_rect, 2)
-            diff_text = self.small_font.render(difficulty.capitalize(), True, BLACK)
-            text_rect = diff_text.get_rect(center=diff_rect.center)
-            self.screen.blit(diff_text, text_rect)
+            pygame.draw.rect(surface, BLACK, diff_rect, 2)
+            self.small_font.draw(surface, difficulty.capitalize(), BLACK, center=diff_rect.center)
             
             diff_x += 90
         
         # Check solution button
         check_rect = pygame.Rect(GRID_X_OFFSET + 410, button_y, 120, 40)
-        pygame.draw.rect(self.screen, LIGHT_GRAY, check_rect)
-        pygame.draw.rect(self.screen, BLACK, check_rect, 2)
-        check_text = self.small_font.render("Check", True, BLACK)
-        text_rect = check_text.get_rect(center=check_rect.center)
-        self.screen.blit(check_text, text_rect)
+        pygame.draw.rect(surface, LIGHT_GRAY, check_rect)
+        pygame.draw.rect(surface, BLACK, check_rect, 2)
+        self.small_font.draw(surface, "Check", BLACK, center=check_rect.center)
         
         return new_game_rect, check_rect
     
-    def draw_info(self):
+    def draw_info(self, surface):
         """Draw game information"""
         info_y = 50
         
         # Title
-        title_text = self.font.render("SUDOKU", True, BLACK)
-        title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, info_y))
-        self.screen.blit(title_text, title_rect)
+        self.font.draw(surface, "SUDOKU", BLACK, center=(SCREEN_WIDTH // 2, info_y))
         
         # Game over message
         if self.game_over:
-            win_text = self.font.render("Congratulations! You solved it!", True, GREEN)
-            win_rect = win_text.get_rect(center=(SCREEN_WIDTH // 2, info_y + 40))
-            self.screen.blit(win_text, win_rect)
+            self.font.draw(surface, "Congratulations! You solved it!", GREEN,
+                           center=(SCREEN_WIDTH // 2, info_y + 40))
+    
+    def build_background(self):
+        """Render the parts that only change with the difficulty or game over state"""
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.background.fill(WHITE)
+        self.new_game_rect, self.check_rect = self.draw_buttons(self.background)
+        self.draw_info(self.background)
+        self.background_key = (self.difficulty, self.game_over)
+    
+    def render(self):
+        """Redraw only what changed since the last frame"""
+        if not self.needs_redraw:
+            self.frames_skipped += 1
+            return
+        self.needs_redraw = False
+        
+        if (self.difficulty, self.game_over) != self.background_key:
+            self.build_background()
+            self.cell_states = {}
+        
+        full_redraw = not self.cell_states
+        if full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        
+        dirty_rects = []
+        for row in range(GRID_SIZE):
+            for col in range(GRID_SIZE):
+                state = self.get_cell_state(row, col)
+                if self.cell_states.get((row, col)) != state:
+                    self.cell_states[(row, col)] = state
+                    dirty_rects.append(self.draw_cell(row, col, state))
+        
+        # Redrawn cells cover part of the box borders and the title text, so
+        # draw those again inside each cell only, not over what is still on screen
+        for rect in dirty_rects:
+            self.screen.set_clip(rect)
+            self.draw_box_lines()
+            self.draw_info(self.screen)
+        self.screen.set_clip(None)
+        
+        if full_redraw:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+        else:
+            self.frames_skipped += 1
+            return
+        self.frames_rendered += 1
     
-    def handle_button_click(self, pos, new_game_rect, check_rect):
+    def handle_button_click(self, pos):
         """Handle button clicks"""
         x, y = pos
         
         # New Game button
-        if new_game_rect.collidepoint(pos):
+        if self.new_game_rect.collidepoint(pos):
             self.new_game()
             return
         
@@ -302,24 +335,44 @@ class Sudoku:
             diff_x += 90
         
         # Check solution button
-        if check_rect.collidepoint(pos):
+        if self.check_rect.collidepoint(pos):
             self.game_over = self.is_game_over()
     
+    def get_events(self):
+        """Return pending events, sleeping until one arrives in event-driven mode"""
+        if not self.event_driven:
+            return pygame.event.get()
+        
+        # Wakes up on input or after the idle timeout
+        event = pygame.event.wait(IDLE_TIMEOUT)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+    
     def run(self):
         """Main game loop"""
         running = True
         
+        if self.event_driven:
+            # Mouse movement never changes the board, so don't wake up for it
+            pygame.event.set_blocked(pygame.MOUSEMOTION)
+        
         while running:
-            new_game_rect, check_rect = self.draw_buttons()
-            
-            for event in pygame.event.get():
+            for event in self.get_events():
+                # Any input may change what is on screen
+                self.needs_redraw = True
+                
                 if event.type == pygame.QUIT:
                     running = False
                 
+                elif event.type == pygame.WINDOWEXPOSED:
+                    # The window contents were lost, so repaint everything
+                    self.cell_states = {}
+                
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # Left click
                         # Check if a button was clicked
-                        self.handle_button_click(event.pos, new_game_rect, check_rect)
+                        self.handle_button_click(event.pos)
                         
                         # Otherwise, select a cell
                         cell = self.get_cell_from_pos(event.pos)
@@ -335,11 +388,11 @@ class Sudoku:
                             # Number keys 1-9
                             if pygame.K_1 <= event.key <= pygame.K_9:
                                 num = event.key - pygame.K_0
-                                self.board[row][col] = num
+                                self.set_cell(row, col, num)
                             
                             # Delete/Backspace to clear cell
                             elif event.key in [pygame.K_DELETE, pygame.K_BACKSPACE]:
-                                self.board[row][col] = 0
+                                self.set_cell(row, col, 0)
                             
                             # Arrow keys to navigate
                             elif event.key == pygame.K_UP and row > 0:
@@ -355,15 +408,14 @@ class Sudoku:
             if not self.game_over and self.is_game_over():
                 self.game_over = True
             
-            # Draw everything
-            self.screen.fill(WHITE)
-            self.draw_grid()
-            self.draw_buttons()
-            self.draw_info()
+            # Draw whatever changed
+            self.render()
             
-            pygame.display.flip()
-            self.clock.tick(30)
+            if not self.event_driven:
+                self.clock.tick(30)
         
+        print(f"Frames rendered: {self.frames_rendered}, skipped: {self.frames_skipped}")
+        self.prefetcher.stop()
         pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+
+from sudoku_generator import line_to_board
+
+# Bank file layout:
+#   header: magic, version, record size, number of index entries
+#   index:  one (difficulty, first record offset, record count) entry per difficulty
+#   records: fixed-width "<81-char puzzle> <81-char solution>\n" lines, grouped by difficulty
+MAGIC = b"SUDOKUBK"
+VERSION = 1
+HEADER = struct.Struct("<8sHHH")
+NAME_LENGTH = 8
+INDEX_ENTRY = struct.Struct(f"<{NAME_LENGTH}sQQ")
+PUZZLE_LENGTH = 81
+RECORD_SIZE = 2 * PUZZLE_LENGTH + 2
+
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sudoku_bank.dat")
+
+
+def write_bank(path, sources):
+    """Write a bank file from a {difficulty: iterable of record lines} mapping
+
+    Record lines use the sudoku_batch.py output format, so batch files can be
+    passed in directly.
+    """
+    difficulties = list(sources)
+    index_size = HEADER.size + INDEX_ENTRY.size * len(difficulties)
+    entries = []
+
+    with open(path, "wb") as bank:
+        bank.seek(index_size)
+        offset = index_size
+
+        for difficulty in difficulties:
+            count = 0
+            for line in sources[difficulty]:
+                record = line.rstrip("\r\n").encode("ascii") + b"\n"
+                if len(record) != RECORD_SIZE:
+                    raise ValueError(f"Bad {difficulty} record of length {len(record)}")
+                bank.write(record)
+                count += 1
+            entries.append((difficulty, offset, count))
+            offset += count * RECORD_SIZE
+
+        bank.seek(0)
+        bank.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, len(entries)))
+        for difficulty, offset, count in entries:
+            bank.write(INDEX_ENTRY.pack(difficulty.encode("ascii"), offset, count))
+
+    return {difficulty: count for difficulty, _, count in entries}
+
+
+class PuzzleBank:
+    """Read-only, memory-mapped view of a puzzle bank file
+
+    Only the header and index are parsed up front; records are sliced out of
+    the mapping on demand, so picking a puzzle is O(1).
+    """
+
+    def __init__(self, path=DEFAULT_BANK_PATH):
+        self.file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self.file.close()
+            raise
+
+        try:
+            self.index = self.read_index(path)
+        except Exception:
+            self.close()
+            raise
+
+    def read_index(self, path):
+        """Parse the header and index, checking every record range lies inside the file"""
+        size = len(self.data)
+        if size < HEADER.size:
+            raise ValueError(f"{path} is too short to be a puzzle bank")
+        magic, version, record_size, entry_count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} is not a supported puzzle bank")
+
+        index_end = HEADER.size + entry_count * INDEX_ENTRY.size
+        if index_end > size:
+            raise ValueError(f"{path} has a truncated index")
+
+        index = {}
+        for i in range(entry_count):
+            name, offset, count = INDEX_ENTRY.unpack_from(self.data, HEADER.size + i * INDEX_ENTRY.size)
+            name = name.rstrip(b"\0").decode("ascii")
+            if offset < index_end or offset + count * RECORD_SIZE > size:
+                raise ValueError(f"{path} is truncated: {name} records run past the end of the file")
+            index[name] = (offset, count)
+        return index
+
+    def count(self, difficulty):
+        """Number of puzzles stored for a difficulty"""
+        return self.index.get(difficulty, (0, 0))[1]
+
+    def get(self, difficulty, number):
+        """Return the (puzzle, solution) boards of one record"""
+        offset, count = self.index[difficulty]
+        if not 0 <= number < count:
+            raise IndexError(f"{difficulty} puzzle {number} out of range")
+
+        start = offset + number * RECORD_SIZE
+        record = self.data[start:start + RECORD_SIZE].decode("ascii")
+        return line_to_board(record[:PUZZLE_LENGTH]), line_to_board(record[PUZZLE_LENGTH + 1:-1])
+
+    def random_puzzle(self, difficulty, rng=None):
+        """Return a random (puzzle, solution) for a difficulty, or None if there are none"""
+        count = self.count(difficulty)
+        if count == 0:
+            return None
+        return self.get(difficulty, (rng or random).randrange(count))
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+
+def open_bank(path=DEFAULT_BANK_PATH):
+    """Open a puzzle bank, returning None when it is missing or unreadable"""
+    try:
+        return PuzzleBank(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a Sudoku puzzle bank from sudoku_batch.py output")
+    parser.add_argument("sources", nargs="+", metavar="DIFFICULTY=FILE",
+                        help="batch output file for a difficulty, e.g. hard=hard.txt")
+    parser.add_argument("-o", "--output", default=DEFAULT_BANK_PATH, help="bank file to write")
+    args = parser.parse_args(argv)
+
+    files = {}
+    for source in args.sources:
+        difficulty, sep, filename = source.partition("=")
+        if not sep or len(difficulty.encode("ascii")) > NAME_LENGTH:
+            parser.error(f"bad source {source!r}")
+        files[difficulty] = open(filename)
+
+    try:
+        counts = write_bank(args.output, files)
+    finally:
+        for handle in files.values():
+            handle.close()
+
+    for difficulty, count in counts.items():
+        print(f"{difficulty}: {count} puzzles")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,95 @@
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+
+from sudoku_generator import DIFFICULTY_CLUES, TIME_BUDGET, board_to_line, generate_puzzle
+
+# Puzzles generated per task handed to a worker
+SHARD_SIZE = 100
+
+
+def generate_shard(task):
+    """Generate one shard of puzzles and return them as output lines"""
+    shard_index, count, difficulty, seed, time_budget, attempts = task
+    # Each shard gets its own seed, so without a time budget its puzzles
+    # depend only on the seed, not on which worker runs it or how busy it is
+    rng = random.Random(seed * 1_000_003 + shard_index)
+
+    lines = []
+    for _ in range(count):
+        puzzle, solution = generate_puzzle(difficulty, time_budget, rng, attempts)
+        lines.append(f"{board_to_line(puzzle)} {board_to_line(solution)}\n")
+    return lines
+
+
+def make_tasks(count, difficulty, seed, time_budget, attempts=None):
+    """Split 'count' puzzles into shard tasks"""
+    tasks = []
+    for shard_index, start in enumerate(range(0, count, SHARD_SIZE)):
+        shard_count = min(SHARD_SIZE, count - start)
+        tasks.append((shard_index, shard_count, difficulty, seed, time_budget, attempts))
+    return tasks
+
+
+def run_batch(count, difficulty, output, workers=None, seed=0, time_budget=TIME_BUDGET, attempts=None):
+    """Generate puzzles across a process pool, streaming lines to 'output'
+
+    Shards are written in order. With time_budget=None generation has no
+    deadline, so the output is the same for a given seed on any machine.
+    """
+    tasks = make_tasks(count, difficulty, seed, time_budget, attempts)
+    done = 0
+    start = time.perf_counter()
+
+    with multiprocessing.Pool(workers) as pool:
+        for lines in pool.imap(generate_shard, tasks):
+            output.writelines(lines)
+            done += len(lines)
+            elapsed = time.perf_counter() - start
+            print(f"\r{done}/{count} puzzles, {done / elapsed:.1f} puzzles/sec",
+                  end="", file=sys.stderr, flush=True)
+
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+    return done, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Sudoku puzzles without a display")
+    parser.add_argument("count", type=int, help="number of puzzles to generate")
+    parser.add_argument("-d", "--difficulty", choices=list(DIFFICULTY_CLUES), default="medium")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="base random seed")
+    parser.add_argument("-t", "--time-budget", type=float, default=TIME_BUDGET,
+                        help="seconds allowed to carve each puzzle")
+    parser.add_argument("-a", "--attempts", type=int, default=None,
+                        help="drop the time budget and try at most this many candidates per puzzle, "
+                             "making the output reproducible for a seed")
+    args = parser.parse_args(argv)
+    time_budget = None if args.attempts else args.time_budget
+
+    if args.output == "-":
+        done, elapsed = run_batch(args.count, args.difficulty, sys.stdout,
+                                  args.workers, args.seed, time_budget, args.attempts)
+    else:
+        with open(args.output, "w") as output:
+            done, elapsed = run_batch(args.count, args.difficulty, output,
+                                      args.workers, args.seed, time_budget, args.attempts)
+
+    print(f"Generated {done} {args.difficulty} puzzles in {elapsed:.2f}s "
+          f"({done / elapsed:.1f} puzzles/sec)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        # stdout may be the puzzle stream; worker errors carry the worker's traceback as their cause
+        if e.__cause__ is not None:
+            print(e.__cause__, file=sys.stderr)
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,157 @@
+import queue
+import random
+import threading
+import time
+
+from sudoku_grader import SudokuGrader
+from sudoku_solver import GRID_SIZE, SudokuSolver
+
+# Minimum number of clues left on the board for each difficulty. Carving
+# stops here, so this sets which techniques a candidate can end up needing;
+# the difficulty itself is decided by DIFFICULTY_SCORES.
+DIFFICULTY_CLUES = {
+    "easy": 51,
+    "medium": 31,
+    "hard": 22
+}
+
+# Target SudokuGrader score range (inclusive) for each difficulty:
+# easy needs naked singles only, medium needs hidden singles and at most one
+# locked-candidates step, hard needs more (pairs, X-wings or guessing)
+DIFFICULTY_SCORES = {
+    "easy": (0, 1),
+    "medium": (2, 8),
+    "hard": (9, 10_000)
+}
+
+# Default time budget for carving a puzzle, in seconds
+TIME_BUDGET = 0.5
+
+# Candidates generate_puzzle tries when it runs without a time budget
+ATTEMPTS = 20
+
+# Ready puzzles kept per difficulty by PuzzlePrefetcher
+PREFETCH_SIZE = 2
+
+
+def generate_solution(rng=None):
+    """Generate a complete valid Sudoku board"""
+    rng = rng or random
+    board = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+    SudokuSolver(rng).solve(board)
+    return board
+
+
+def carve_puzzle(board, min_clues, time_budget=TIME_BUDGET, rng=None):
+    """Remove clues from a solved board in place while the solution stays unique
+
+    Cells are tried one at a time in random order and a removal is kept only
+    if the solver still finds exactly one solution. Carving stops at
+    'min_clues' clues or once 'time_budget' seconds have passed; with a
+    time_budget of None every cell is tried, so the result depends only on rng.
+    """
+    rng = rng or random
+    solver = SudokuSolver()
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    cells = [(i, j) for i in range(GRID_SIZE) for j in range(GRID_SIZE)]
+    rng.shuffle(cells)
+    clues = GRID_SIZE * GRID_SIZE
+
+    for row, col in cells:
+        if clues <= min_clues or (deadline is not None and time.perf_counter() >= deadline):
+            break
+
+        value = board[row][col]
+        board[row][col] = 0
+        if solver.count_solutions(board, limit=2) == 1:
+            clues -= 1
+        else:
+            board[row][col] = value
+
+    return clues
+
+
+def generate_puzzle(difficulty="medium", time_budget=TIME_BUDGET, rng=None, attempts=None):
+    """Generate a (puzzle, solution) pair with a unique solution
+
+    Puzzles are generated and graded until one falls in the difficulty's score
+    band; if the time budget or 'attempts' candidates run out first, the
+    closest one is returned. With a time_budget of None there is no clock
+    involved (attempts defaults to ATTEMPTS), so the same rng state always
+    gives the same puzzle.
+    """
+    if time_budget is None:
+        deadline = None
+        attempts = attempts or ATTEMPTS
+    else:
+        deadline = time.perf_counter() + time_budget
+    min_clues = DIFFICULTY_CLUES.get(difficulty, DIFFICULTY_CLUES["medium"])
+    low, high = DIFFICULTY_SCORES.get(difficulty, DIFFICULTY_SCORES["medium"])
+    grader = SudokuGrader()
+    best = None
+    tried = 0
+
+    while True:
+        solution = generate_solution(rng)
+        puzzle = [row[:] for row in solution]
+        budget = None if deadline is None else max(deadline - time.perf_counter(), 0)
+        carve_puzzle(puzzle, min_clues, budget, rng)
+        tried += 1
+
+        score = grader.grade(puzzle)['score']
+        distance = max(low - score, score - high, 0)
+        if best is None or distance < best[0]:
+            best = (distance, puzzle, solution)
+        if (distance == 0 or (attempts and tried >= attempts) or
+                (deadline is not None and time.perf_counter() >= deadline)):
+            return best[1], best[2]
+
+
+def board_to_line(board):
+    """Encode a board as an 81-character string, with 0 for empty cells"""
+    return ''.join(str(value) for row in board for value in row)
+
+
+def line_to_board(line):
+    """Decode an 81-character string back into a 9x9 board"""
+    return [[int(ch) for ch in line[r * GRID_SIZE:(r + 1) * GRID_SIZE]] for r in range(GRID_SIZE)]
+
+
+class PuzzlePrefetcher:
+    """Keeps a small queue of ready puzzles per difficulty, refilled in the background
+
+    'source' is called as source(difficulty) and must return a
+    (puzzle, solution) pair; it defaults to generate_puzzle.
+    """
+
+    def __init__(self, source=None, difficulties=DIFFICULTY_CLUES, size=PREFETCH_SIZE):
+        self.source = source or generate_puzzle
+        self.queues = {difficulty: queue.Queue(maxsize=size) for difficulty in difficulties}
+        self.wakeup = threading.Event()
+        self.running = True
+        self.thread = threading.Thread(target=self.fill, name="PuzzlePrefetcher", daemon=True)
+        self.thread.start()
+
+    def get(self, difficulty):
+        """Take a ready puzzle, generating one on the spot if the queue is empty"""
+        try:
+            puzzle = self.queues[difficulty].get_nowait()
+        except (KeyError, queue.Empty):
+            puzzle = self.source(difficulty)
+        self.wakeup.set()
+        return puzzle
+
+    def fill(self):
+        """Background loop: top up every queue, then sleep until a puzzle is taken"""
+        while self.running:
+            for difficulty, ready in self.queues.items():
+                while self.running and not ready.full():
+                    ready.put(self.source(difficulty))
+            self.wakeup.wait()
+            self.wakeup.clear()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        self.thread.join()
@@ -0,0 +1,301 @@
+import argparse
+import multiprocessing
+import sys
+import time
+
+from sudoku_solver import (ALL_DIGITS, CELL_COUNT, GRID_SIZE, POPCOUNT, UNITS, SudokuSolver, board_to_cells,
+                           cells_to_board)
+
+# Cells sharing a row, column or box with each cell
+PEERS = [tuple(sorted({j for unit in UNITS if i in unit for j in unit} - {i})) for i in range(CELL_COUNT)]
+
+
+def _line_box_intersections():
+    """Every (line-box intersection, rest of line, rest of box) triple of cell tuples"""
+    triples = []
+    for line in UNITS[:2 * GRID_SIZE]:
+        for box in UNITS[2 * GRID_SIZE:]:
+            shared = tuple(i for i in line if i in box)
+            if shared:
+                line_rest = tuple(i for i in line if i not in shared)
+                box_rest = tuple(i for i in box if i not in shared)
+                triples.append((shared, line_rest, box_rest))
+    return triples
+
+
+INTERSECTIONS = _line_box_intersections()
+
+# Weight of each technique, in the order techniques are tried
+TECHNIQUE_WEIGHTS = {
+    "naked_single": 1,
+    "hidden_single": 2,
+    "locked_candidates": 4,
+    "naked_pair": 6,
+    "hidden_pair": 8,
+    "x_wing": 12,
+    "guess": 40
+}
+
+# Techniques every solve leans on; repeating them does not make a puzzle harder
+SINGLES = ("naked_single", "hidden_single")
+
+
+class SudokuGrader:
+    """Rates a puzzle by solving it the way a person would
+
+    Techniques are tried cheapest first and the search restarts from the
+    cheapest one after every step, so the score reflects the easiest logical
+    path. When no technique applies, one cell is filled from the solution
+    and counted as a guess.
+
+    The score is the weight of the hardest technique needed plus the weight
+    of every step above the singles tier. Singles only add through the
+    hardest technique, so the number of blanks does not drive the score:
+    naked singles alone score 1 and hidden singles 2, whatever the clue count.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.cands = []
+        self.empty = 0
+        self.techniques = [
+            ("naked_single", self.naked_single),
+            ("hidden_single", self.hidden_single),
+            ("locked_candidates", self.locked_candidates),
+            ("naked_pair", self.naked_pair),
+            ("hidden_pair", self.hidden_pair),
+            ("x_wing", self.x_wing)
+        ]
+
+    def grade(self, board):
+        """Return a dict with the score, hardest technique and per-technique step counts"""
+        self.values = board_to_cells(board)
+        self.cands = [0 if value else ALL_DIGITS for value in self.values]
+        self.empty = self.values.count(0)
+        for i, value in enumerate(self.values):
+            if value:
+                bit = 1 << (value - 1)
+                for peer in PEERS[i]:
+                    self.cands[peer] &= ~bit
+
+        steps = {}
+        score = 0
+        hardest = None
+        solution = None
+
+        while self.empty:
+            for name, technique in self.techniques:
+                count = technique()
+                if count:
+                    break
+            else:
+                if solution is None:
+                    solution = [row[:] for row in cells_to_board(self.values)]
+                    if not SudokuSolver().solve(solution):
+                        raise ValueError("Puzzle has no solution")
+                    solution = board_to_cells(solution)
+                name, count = "guess", 1
+                self.guess(solution)
+
+            steps[name] = steps.get(name, 0) + count
+            if name not in SINGLES:
+                score += TECHNIQUE_WEIGHTS[name] * count
+            if hardest is None or TECHNIQUE_WEIGHTS[name] > TECHNIQUE_WEIGHTS[hardest]:
+                hardest = name
+
+        if hardest is not None:
+            score += TECHNIQUE_WEIGHTS[hardest]
+        return {'score': score, 'hardest': hardest, 'steps': steps}
+
+    def assign(self, i, digit):
+        """Place a digit and remove it from the candidates of its peers"""
+        bit = 1 << (digit - 1)
+        self.values[i] = digit
+        self.cands[i] = 0
+        self.empty -= 1
+        cands = self.cands
+        for peer in PEERS[i]:
+            cands[peer] &= ~bit
+
+    def eliminate(self, cells, mask):
+        """Remove candidate digits from cells, returning True if anything changed"""
+        cands = self.cands
+        changed = False
+        for i in cells:
+            if cands[i] & mask:
+                cands[i] &= ~mask
+                changed = True
+        return changed
+
+    def guess(self, solution):
+        """Fill the most constrained empty cell from the known solution"""
+        best = min((i for i in range(CELL_COUNT) if self.values[i] == 0),
+                   key=lambda i: POPCOUNT[self.cands[i]])
+        self.assign(best, solution[best])
+
+    def naked_single(self):
+        count = 0
+        cands = self.cands
+        for i in range(CELL_COUNT):
+            mask = cands[i]
+            if mask and mask & (mask - 1) == 0:
+                self.assign(i, mask.bit_length())
+                count += 1
+        return count
+
+    def hidden_single(self):
+        count = 0
+        cands = self.cands
+        for unit in UNITS:
+            once = 0
+            twice = 0
+            for i in unit:
+                mask = cands[i]
+                twice |= once & mask
+                once |= mask
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for i in unit:
+                    if cands[i] & bit:
+                        self.assign(i, bit.bit_length())
+                        count += 1
+                        break
+        return count
+
+    def locked_candidates(self):
+        """Pointing and claiming: a digit confined to a line-box intersection"""
+        cands = self.cands
+        for shared, line_rest, box_rest in INTERSECTIONS:
+            inside = cands[shared[0]] | cands[shared[1]] | cands[shared[2]]
+            if not inside:
+                continue
+            line_mask = 0
+            for i in line_rest:
+                line_mask |= cands[i]
+            box_mask = 0
+            for i in box_rest:
+                box_mask |= cands[i]
+
+            pointing = inside & ~box_mask & line_mask
+            if pointing and self.eliminate(line_rest, pointing):
+                return 1
+            claiming = inside & ~line_mask & box_mask
+            if claiming and self.eliminate(box_rest, claiming):
+                return 1
+        return 0
+
+    def naked_pair(self):
+        cands = self.cands
+        for unit in UNITS:
+            seen = {}
+            for i in unit:
+                mask = cands[i]
+                if POPCOUNT[mask] == 2:
+                    if mask in seen:
+                        others = [j for j in unit if j != i and j != seen[mask]]
+                        if self.eliminate(others, mask):
+                            return 1
+                    else:
+                        seen[mask] = i
+        return 0
+
+    def hidden_pair(self):
+        cands = self.cands
+        for unit in UNITS:
+            # Bitmask of unit positions where each digit can go
+            places = [0] * GRID_SIZE
+            for pos, i in enumerate(unit):
+                mask = cands[i]
+                while mask:
+                    bit = mask & -mask
+                    mask ^= bit
+                    places[bit.bit_length() - 1] |= 1 << pos
+
+            seen = {}
+            for digit in range(GRID_SIZE):
+                where = places[digit]
+                if POPCOUNT[where] == 2:
+                    if where in seen:
+                        pair = (1 << digit) | (1 << seen[where])
+                        changed = False
+                        for pos in range(GRID_SIZE):
+                            if where >> pos & 1:
+                                i = unit[pos]
+                                if cands[i] & ~pair:
+                                    cands[i] &= pair
+                                    changed = True
+                        if changed:
+                            return 1
+                    else:
+                        seen[where] = digit
+        return 0
+
+    def x_wing(self):
+        cands = self.cands
+        for digit in range(GRID_SIZE):
+            bit = 1 << digit
+            for lines, crosses in ((UNITS[:GRID_SIZE], UNITS[GRID_SIZE:2 * GRID_SIZE]),
+                                   (UNITS[GRID_SIZE:2 * GRID_SIZE], UNITS[:GRID_SIZE])):
+                seen = {}
+                for index, line in enumerate(lines):
+                    where = 0
+                    for pos, i in enumerate(line):
+                        if cands[i] & bit:
+                            where |= 1 << pos
+                    if POPCOUNT[where] != 2:
+                        continue
+                    if where in seen:
+                        # Two lines share the same two positions: clear the digit
+                        # from those crossing lines everywhere else
+                        wing = (index, seen[where])
+                        others = [cross[k] for pos, cross in enumerate(crosses) if where >> pos & 1
+                                  for k in range(GRID_SIZE) if k not in wing]
+                        if self.eliminate(others, bit):
+                            return 1
+                    else:
+                        seen[where] = index
+        return 0
+
+
+def grade_line(line):
+    """Grade one puzzle line in the sudoku_batch.py output format"""
+    return SudokuGrader().grade(cells_to_board([int(ch) for ch in line[:CELL_COUNT]]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rate Sudoku puzzles by the techniques needed to solve them")
+    parser.add_argument("input", help="sudoku_batch.py output file")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    with open(args.input) as source:
+        lines = [line for line in source if line.strip()]
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        grades = pool.map(grade_line, lines, chunksize=256)
+    elapsed = time.perf_counter() - start
+
+    hardest = {}
+    for grade in grades:
+        hardest[grade['hardest']] = hardest.get(grade['hardest'], 0) + 1
+    for name in TECHNIQUE_WEIGHTS:
+        if name in hardest:
+            print(f"{name}: {hardest[name]}")
+
+    scores = sorted(grade['score'] for grade in grades)
+    if scores:
+        print(f"Score min/median/max: {scores[0]}/{scores[len(scores) // 2]}/{scores[-1]}")
+    print(f"Graded {len(grades)} puzzles in {elapsed:.2f}s ({len(grades) / elapsed:.1f} puzzles/sec)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,192 @@
+# Board geometry
+GRID_SIZE = 9
+BOX_SIZE = 3
+CELL_COUNT = GRID_SIZE * GRID_SIZE
+ALL_DIGITS = (1 << GRID_SIZE) - 1  # One bit per digit: bit 0 is 1, bit 8 is 9
+
+# Lookup tables for flat cell indices (index = row * 9 + col)
+ROW_OF = [i // GRID_SIZE for i in range(CELL_COUNT)]
+COL_OF = [i % GRID_SIZE for i in range(CELL_COUNT)]
+BOX_OF = [(ROW_OF[i] // BOX_SIZE) * BOX_SIZE + COL_OF[i] // BOX_SIZE for i in range(CELL_COUNT)]
+
+# The 27 units (rows, columns, boxes) as tuples of cell indices
+UNITS = (
+    [tuple(r * GRID_SIZE + c for c in range(GRID_SIZE)) for r in range(GRID_SIZE)] +
+    [tuple(r * GRID_SIZE + c for r in range(GRID_SIZE)) for c in range(GRID_SIZE)] +
+    [tuple(i for i in range(CELL_COUNT) if BOX_OF[i] == b) for b in range(GRID_SIZE)]
+)
+
+# Candidate mask lookups
+POPCOUNT = [bin(mask).count('1') for mask in range(ALL_DIGITS + 1)]
+MASK_DIGITS = [tuple(d + 1 for d in range(GRID_SIZE) if mask >> d & 1) for mask in range(ALL_DIGITS + 1)]
+
+
+def board_to_cells(board):
+    """Flatten a 9x9 board into a list of 81 ints"""
+    return [value for row in board for value in row]
+
+
+def cells_to_board(cells):
+    """Turn a list of 81 ints back into a 9x9 board"""
+    return [list(cells[r * GRID_SIZE:(r + 1) * GRID_SIZE]) for r in range(GRID_SIZE)]
+
+
+class SudokuSolver:
+    """Constraint-propagation solver using row/column/box candidate bitmasks
+
+    Each search node applies naked and hidden singles until nothing changes,
+    then branches on the empty cell with the fewest candidates.
+    """
+
+    def __init__(self, rng=None):
+        # When an rng is given, branch digits are tried in random order
+        self.rng = rng
+        self.nodes = 0
+        self.backtracks = 0
+        self._limit = 1
+        self._solutions = []
+
+    @property
+    def stats(self):
+        """Search statistics from the last solve or count"""
+        return {'nodes': self.nodes, 'backtracks': self.backtracks}
+
+    def solve(self, board):
+        """Solve the board in place, returning True if a solution was found"""
+        solutions = self._run(board, 1)
+        if not solutions:
+            return False
+        solved = solutions[0]
+        for row in range(GRID_SIZE):
+            board[row][:] = solved[row * GRID_SIZE:(row + 1) * GRID_SIZE]
+        return True
+
+    def count_solutions(self, board, limit=2):
+        """Count the solutions of the board, stopping as soon as 'limit' are found"""
+        return len(self._run(board, limit))
+
+    def _run(self, board, limit):
+        self.nodes = 0
+        self.backtracks = 0
+        self._limit = limit
+        self._solutions = []
+
+        state = self._load(board)
+        if state is not None:
+            self._search(*state)
+        return self._solutions
+
+    def _load(self, board):
+        """Build the search state from a board, or return None if the givens clash"""
+        cells = board_to_cells(board)
+        rows = [0] * GRID_SIZE
+        cols = [0] * GRID_SIZE
+        boxes = [0] * GRID_SIZE
+
+        for i, value in enumerate(cells):
+            if value:
+                bit = 1 << (value - 1)
+                r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+                if (rows[r] | cols[c] | boxes[b]) & bit:
+                    return None
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[b] |= bit
+        return cells, rows, cols, boxes
+
+    def _propagate(self, cells, rows, cols, boxes):
+        """Apply naked and hidden singles until a fixed point; False on contradiction"""
+        changed = True
+        while changed:
+            changed = False
+
+            # Naked singles: a cell with exactly one candidate left
+            for i in range(CELL_COUNT):
+                if cells[i] == 0:
+                    r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+                    mask = ~(rows[r] | cols[c] | boxes[b]) & ALL_DIGITS
+                    if mask == 0:
+                        return False
+                    if mask & (mask - 1) == 0:
+                        cells[i] = mask.bit_length()
+                        rows[r] |= mask
+                        cols[c] |= mask
+                        boxes[b] |= mask
+                        changed = True
+
+            # Hidden singles: a digit with exactly one possible cell in a unit
+            for unit in UNITS:
+                used = 0
+                once = 0
+                twice = 0
+                for i in unit:
+                    if cells[i]:
+                        used |= 1 << (cells[i] - 1)
+                    else:
+                        mask = ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]]) & ALL_DIGITS
+                        twice |= once & mask
+                        once |= mask
+                if (once | used) != ALL_DIGITS:
+                    return False
+                hidden = once & ~twice & ~used
+                while hidden:
+                    bit = hidden & -hidden
+                    hidden ^= bit
+                    for i in unit:
+                        if cells[i] == 0:
+                            r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+                            if not (rows[r] | cols[c] | boxes[b]) & bit:
+                                cells[i] = bit.bit_length()
+                                rows[r] |= bit
+                                cols[c] |= bit
+                                boxes[b] |= bit
+                                changed = True
+                                break
+                    else:
+                        # An earlier placement in this pass took the only spot
+                        return False
+        return True
+
+    def _search(self, cells, rows, cols, boxes):
+        """Depth-first search; returns True once enough solutions are collected"""
+        self.nodes += 1
+        if not self._propagate(cells, rows, cols, boxes):
+            return False
+
+        # Pick the most constrained empty cell
+        best = -1
+        best_mask = 0
+        best_count = GRID_SIZE + 1
+        for i in range(CELL_COUNT):
+            if cells[i] == 0:
+                mask = ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]]) & ALL_DIGITS
+                count = POPCOUNT[mask]
+                if count < best_count:
+                    best, best_mask, best_count = i, mask, count
+                    if count == 2:
+                        break
+
+        if best < 0:
+            self._solutions.append(cells)
+            return len(self._solutions) >= self._limit
+
+        digits = list(MASK_DIGITS[best_mask])
+        if self.rng is not None:
+            self.rng.shuffle(digits)
+
+        r, c, b = ROW_OF[best], COL_OF[best], BOX_OF[best]
+        for digit in digits:
+            bit = 1 << (digit - 1)
+            child_cells = cells[:]
+            child_cells[best] = digit
+            child_rows = rows[:]
+            child_cols = cols[:]
+            child_boxes = boxes[:]
+            child_rows[r] |= bit
+            child_cols[c] |= bit
+            child_boxes[b] |= bit
+            if self._search(child_cells, child_rows, child_cols, child_boxes):
+                return True
+            self.backtracks += 1
+        return False
+
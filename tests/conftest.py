@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The games are top-level modules, so make the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,158 @@
+import pytest
+
+from tetris_board import Playfield, column_heights
+from tetris_pieces import ROTATIONS
+from tetris_sim import LINE_SCORES, LINES_PER_LEVEL, TetrisSim
+
+WIDTH = 10
+HEIGHT = 20
+EMPTY = (0, 0, 0)
+
+
+def fill(playfield, y, color, columns=range(WIDTH)):
+    """Lock single squares into a row, keeping heights up to date like a real piece lock"""
+    for x in columns:
+        playfield.lock(((0, 1),), ((0, 0),), x, y, color)
+
+
+def row_color(y):
+    return (y, y, y)
+
+
+def make_playfield(full_rows, partial_rows=()):
+    """Playfield with the given full rows and rows missing column 0, each colored by its index"""
+    playfield = Playfield(WIDTH, HEIGHT, EMPTY)
+    for y in full_rows:
+        fill(playfield, y, row_color(y))
+    for y in partial_rows:
+        fill(playfield, y, row_color(y), range(1, WIDTH))
+    return playfield
+
+
+def expected_colors(playfield, cleared):
+    """Color layer after removing rows the slow way, for comparison"""
+    colors = [row[:] for row in playfield.colors]
+    for y in sorted(cleared):
+        del colors[y]
+        colors.insert(0, [EMPTY] * WIDTH)
+    return colors
+
+
+def test_no_full_rows():
+    playfield = make_playfield([], partial_rows=[19, 18])
+    rows = list(playfield.rows)
+
+    assert playfield.clear_full_rows() == 0
+    assert playfield.rows == rows
+    assert playfield.heights == column_heights(rows, WIDTH)
+
+
+def test_single_clear():
+    playfield = make_playfield([19], partial_rows=[18])
+    expected = expected_colors(playfield, [19])
+
+    assert playfield.clear_full_rows() == 1
+    assert playfield.colors == expected
+    # The partial row dropped into the bottom row
+    assert playfield.colors[19][0] == EMPTY
+    assert playfield.colors[19][1] == row_color(18)
+    assert playfield.rows[0] == playfield.wall_row
+
+
+@pytest.mark.parametrize("full_rows, partial_rows", [
+    ([19, 17], [18, 16]),
+    ([18, 16, 14], [19, 17, 15, 13]),
+    ([19, 15, 11], [18, 17, 16, 14, 13, 12, 10]),
+])
+def test_non_contiguous_clears(full_rows, partial_rows):
+    playfield = make_playfield(full_rows, partial_rows)
+    expected = expected_colors(playfield, full_rows)
+
+    assert playfield.clear_full_rows() == len(full_rows)
+    assert playfield.colors == expected
+    assert playfield.full_row not in playfield.rows
+    # The kept rows stay in order at the bottom
+    kept = sorted(partial_rows)
+    bottom = HEIGHT - len(kept)
+    assert [playfield.colors[y][1] for y in range(bottom, HEIGHT)] == [row_color(y) for y in kept]
+    assert all(row == playfield.wall_row for row in playfield.rows[:bottom])
+
+
+def test_four_line_clear():
+    playfield = make_playfield([16, 17, 18, 19], partial_rows=[15])
+    expected = expected_colors(playfield, [16, 17, 18, 19])
+
+    assert playfield.clear_full_rows() == 4
+    assert playfield.colors == expected
+    assert playfield.colors[19][1] == row_color(15)
+    assert all(row == playfield.wall_row for row in playfield.rows[:19])
+
+
+def test_color_rows_are_reused_and_blanked():
+    playfield = make_playfield([19, 17], partial_rows=[18])
+    colors = playfield.colors
+    cleared_rows = {id(colors[19]), id(colors[17])}
+
+    playfield.clear_full_rows()
+
+    # Cleared color rows become the new, blank top rows; nothing is reallocated
+    assert playfield.colors is colors
+    assert {id(colors[0]), id(colors[1])} == cleared_rows
+    assert colors[0] == [EMPTY] * WIDTH
+    assert colors[1] == [EMPTY] * WIDTH
+    assert len({id(row) for row in colors}) == HEIGHT
+
+
+def test_heights_after_clear():
+    playfield = make_playfield([19, 17], partial_rows=[18])
+    # A block over a hole: column 0 is empty in row 18 but filled in row 16
+    fill(playfield, 16, row_color(16), [0])
+    fill(playfield, 15, row_color(15), [5])
+    assert playfield.heights[0] == 4
+
+    playfield.clear_full_rows()
+
+    assert playfield.heights == column_heights(playfield.rows, WIDTH)
+    # Row 18 (missing column 0) is now the bottom row, with row 16 above it
+    assert playfield.heights[0] == 2
+    assert playfield.heights[1] == 1
+    assert playfield.heights[5] == 3
+
+
+def test_heights_uncover_empty_column():
+    playfield = make_playfield([19])
+
+    playfield.clear_full_rows()
+
+    assert playfield.heights == [0] * WIDTH
+
+
+@pytest.mark.parametrize("lines", [1, 2, 3, 4])
+def test_clear_lines_scores(lines):
+    sim = TetrisSim(seed=0)
+    full_rows = [19 - 2 * i for i in range(lines)]
+    for y in full_rows:
+        fill(sim.board, y, row_color(y))
+    fill(sim.board, 18, row_color(18), range(1, WIDTH))
+
+    sim.clear_lines()
+
+    assert sim.score == LINE_SCORES[lines]
+    assert sim.lines == lines
+
+
+def test_hard_drop_tetris_scores_and_levels_up():
+    sim = TetrisSim(seed=0)
+    sim.lines = LINES_PER_LEVEL - 1
+    for y in range(16, 20):
+        fill(sim.board, y, row_color(y), range(1, WIDTH))
+    # A vertical I piece (type 0, rotation 1) over the gap in column 0
+    sim.current_piece.update(type=0, shape=ROTATIONS[0], rotation=1, x=-2, y=0)
+
+    sim.hard_drop()
+
+    assert sim.score == LINE_SCORES[4]
+    assert sim.lines == LINES_PER_LEVEL + 3
+    assert sim.level == 2
+    assert all(row == sim.board.wall_row for row in sim.board.rows)
+    assert not sim.game_over
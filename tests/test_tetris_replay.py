@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from tetris_replay import (ACTION_BITS, decode_events, encode_events, play_replay, read_replay, state_hash,
+                           write_replay)
+from tetris_sim import ACTIONS, HARD_DROP, LEFT, NOOP, ROTATE, TetrisSim
+
+
+def record_game(seed, moves):
+    """Play random actions on a TetrisSim and return it with its (tick, action) events"""
+    rng = random.Random(seed)
+    sim = TetrisSim(seed, gravity_every=0)
+    events = []
+    tick = 0
+    for _ in range(moves):
+        tick += rng.randrange(1, 40)
+        action = rng.choice(ACTIONS[1:])
+        sim.apply_action(action)
+        events.append((tick, action))
+        if sim.game_over:
+            break
+    return sim, events
+
+
+def test_events_round_trip_with_multi_byte_varints():
+    # Gaps of 16 ticks or more no longer fit in one byte next to the action bits
+    events = [(0, LEFT), (15, ROTATE), (16, NOOP), (16, HARD_DROP), (1000, LEFT), (1 << 20, ROTATE)]
+    data = encode_events(events)
+
+    assert len(data) > len(events)
+    assert data[1] == (15 << ACTION_BITS) | ROTATE
+    assert decode_events(data, len(events)) == events
+
+
+def test_empty_event_stream():
+    assert encode_events([]) == b""
+    assert decode_events(b"", 0) == []
+
+
+@pytest.mark.parametrize("cut", [1, 2])
+def test_truncated_event_stream(cut):
+    events = [(5, LEFT), (300, ROTATE), (5000, HARD_DROP)]
+    data = encode_events(events)
+
+    with pytest.raises(ValueError):
+        decode_events(data[:-cut], len(events))
+
+
+def test_missing_events():
+    events = [(5, LEFT), (6, ROTATE)]
+
+    with pytest.raises(ValueError):
+        decode_events(encode_events(events), len(events) + 1)
+
+
+def test_recorded_game_replays_to_same_state(tmp_path):
+    sim, events = record_game(seed=3, moves=500)
+    path = tmp_path / "game.rpl"
+    write_replay(path, 3, events, sim)
+
+    seed, loaded, score, final_hash = read_replay(path)
+    replayed = play_replay(seed, loaded)
+
+    assert (seed, loaded, score) == (3, events, sim.score)
+    assert final_hash == state_hash(sim)
+    assert state_hash(replayed) == final_hash
+    assert replayed.score == sim.score
+
+
+def test_replay_with_wrong_seed_does_not_match():
+    sim, events = record_game(seed=3, moves=200)
+
+    assert state_hash(play_replay(4, events)) != state_hash(sim)
+
+
+def test_not_a_replay(tmp_path):
+    path = tmp_path / "bad.rpl"
+    path.write_bytes(b"TETRIS")
+
+    with pytest.raises(ValueError):
+        read_replay(path)
@@ -1,6 +1,14 @@
+import argparse
 import pygame
 import random
 import sys
+import time
+from collections import deque
+
+from tetris_ai import TetrisAI
+from tetris_replay import write_replay
+from tetris_sim import GRID_HEIGHT, GRID_WIDTH, HARD_DROP, LEFT, RIGHT, ROTATE, SOFT_DROP, TetrisSim
+from text_render import TextRenderer
 
 # Initialize pygame
 pygame.init()
@@ -8,8 +16,6 @@ pygame.init()
 # Game constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-GRID_WIDTH = 10
-GRID_HEIGHT = 20
 CELL_SIZE = 30
 GRID_X_OFFSET = (SCREEN_WIDTH - GRID_WIDTH * CELL_SIZE) // 2
 GRID_Y_OFFSET = (SCREEN_HEIGHT - GRID_HEIGHT * CELL_SIZE) // 2
@@ -18,91 +24,96 @@ GRID_Y_OFFSET = (SCREEN_HEIGHT - GRID_HEIGHT * CELL_SIZE) // 2
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 GRAY = (128, 128, 128)
-CYAN = (0, 255, 255)
-BLUE = (0, 0, 255)
-ORANGE = (255, 165, 0)
-YELLOW = (255, 255, 0)
-GREEN = (0, 255, 0)
-PURPLE = (128, 0, 128)
 RED = (255, 0, 0)
 
-# Tetris piece shapes
-SHAPES = [
-    # I-piece
-    [['.....',
-      '..#..',
-      '..#..',
-      '..#..',
-      '..#..']],
-    
-    # O-piece
-    [['.....',
-      '.....',
-      '.##..',
-      '.##..',
-      '.....']],
-    
-    # T-piece
-    [['.....',
-      '.....',
-      '.#...',
-      '###..',
-      '.....']],
-    
-    # S-piece
-    [['.....',
-      '.....',
-      '.##..',
-      '##...',
-      '.....']],
-    
-    # Z-piece
-    [['.....',
-      '.....',
-      '##...',
-      '.##..',
-      '.....']],
-    
-    # J-piece
-    [['.....',
-      '.#...',
-      '.#...',
-      '##...',
-      '.....']],
-    
-    # L-piece
-    [['.....',
-      '..#..',
-      '..#..',
-      '.##..',
-      '.....']]
-]
-
-# Colors for each piece
-SHAPE_COLORS = [CYAN, YELLOW, PURPLE, GREEN, RED, BLUE, ORANGE]
-
-class Tetris:
-    def __init__(self):
+# Frames averaged by the frame-time counter
+FRAME_SAMPLES = 60
+
+# The simulation advances in fixed ticks; rendering runs at its own rate
+TICK_RATE = 120
+TICK_MS = 1000 / TICK_RATE
+RENDER_FPS = 60
+# Longest stall the simulation catches up on before skipping ahead
+MAX_CATCH_UP_MS = 250
+
+# Delayed auto-shift: hold time before a move repeats, then time per repeat
+DAS_MS = 167
+ARR_MS = 33
+# Gravity while the down arrow is held
+SOFT_DROP_MS = 33
+# Gravity stops speeding up after this level
+MAX_GRAVITY_LEVEL = 20
+
+SHIFT_KEYS = {pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}
+
+
+def gravity_interval(level):
+    """Milliseconds per row of gravity at a level, following the guideline curve"""
+    level = min(level, MAX_GRAVITY_LEVEL)
+    return 1000 * (0.8 - (level - 1) * 0.007) ** (level - 1)
+
+
+class Tetris(TetrisSim):
+    def __init__(self, seed=None, das_ms=DAS_MS, arr_ms=ARR_MS, record_path=None):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Tetris")
         self.clock = pygame.time.Clock()
-        self.grid = [[BLACK for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        self.current_piece = self.get_new_piece()
-        self.game_over = False
-        self.score = 0
-        
-    def get_new_piece(self):
-        shape = random.choice(SHAPES)
-        color = random.choice(SHAPE_COLORS)
-        return {
-            'shape': shape,
-            'color': color,
-            'x': GRID_WIDTH // 2 - 2,
-            'y': 0,
-            'rotation': 0
-        }
-    
+        self.font = TextRenderer('Arial', 24)
+        self.ai = TetrisAI()
+        self.autoplay = False
+
+        # Locked blocks are drawn once onto this surface and blitted each frame
+        self.field = pygame.Surface((GRID_WIDTH * CELL_SIZE, GRID_HEIGHT * CELL_SIZE))
+        self.use_field_cache = True
+        self.frame_times = []
+
+        # Held keys: shift directions in press order, the time until the
+        # next auto-shift, soft drop and accumulated gravity
+        self.das_ms = das_ms
+        self.arr_ms = arr_ms
+        self.shifts = []
+        self.shift_delay = 0
+        self.soft_drop = False
+        self.gravity_time = 0
+
+        # Every action that changed the game, as (tick, action), for the replay
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.record_path = record_path
+        self.ticks = 0
+        self.events = []
+        super().__init__(seed)
+        self.build_field()
+
+    def build_field(self):
+        """Redraw the locked stack onto the cached field surface"""
+        for y in range(GRID_HEIGHT):
+            for x in range(GRID_WIDTH):
+                rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                pygame.draw.rect(self.field, self.grid[y][x], rect)
+                pygame.draw.rect(self.field, GRAY, rect, 1)
+
+    def lock_piece(self):
+        # Lines are cleared inside lock_piece, so one rebuild covers both
+        super().lock_piece()
+        self.build_field()
+        self.gravity_time = 0
+
+    def act(self, action):
+        """Apply a TetrisSim action and record it if it changed anything"""
+        changed = self.apply_action(action)
+        if changed and self.events is not None:
+            self.events.append((self.ticks, action))
+            if self.game_over:
+                self.save_replay()
+        return changed
+
+    def save_replay(self):
+        if self.record_path and self.events is not None:
+            write_replay(self.record_path, self.seed, self.events, self)
+
     def draw_grid(self):
+        """Full per-cell redraw of the stack, kept to compare against the cached field"""
         for y in range(GRID_HEIGHT):
             for x in range(GRID_WIDTH):
                 rect = pygame.Rect(
@@ -114,150 +125,167 @@ class Tetris:
                 pygame.draw.rect(self.screen, self.grid[y][x], rect)
                 pygame.draw.rect(self.screen, GRAY, rect, 1)
     
-    def draw_piece(self):
-        piece = self.current_piece
-        shape = piece['shape'][piece['rotation']]
-        
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell == '#':
-                    rect = pygame.Rect(
-                        GRID_X_OFFSET + (piece['x'] + x) * CELL_SIZE,
-                        GRID_Y_OFFSET + (piece['y'] + y) * CELL_SIZE,
-                        CELL_SIZE,
-                        CELL_SIZE
-                    )
-                    pygame.draw.rect(self.screen, piece['color'], rect)
-                    pygame.draw.rect(self.screen, GRAY, rect, 1)
-    
-    def check_collision(self, dx=0, dy=0, rotation=None):
-        piece = self.current_piece
-        if rotation is None:
-            rotation = piece['rotation']
-        
-        shape = piece['shape'][rotation]
-        
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell == '#':
-                    new_x = piece['x'] + x + dx
-                    new_y = piece['y'] + y + dy
-                    
-                    if (new_x < 0 or new_x >= GRID_WIDTH or 
-                        new_y >= GRID_HEIGHT):
-                        return True
-                    
-                    if new_y >= 0 and self.grid[new_y][new_x] != BLACK:
-                        return True
-        
-        return False
-    
-    def lock_piece(self):
+    def draw_piece(self, y=None, width=0):
+        """Draw the current piece, or its outline at row y for the ghost"""
         piece = self.current_piece
-        shape = piece['shape'][piece['rotation']]
-        
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell == '#':
-                    grid_y = piece['y'] + y
-                    grid_x = piece['x'] + x
-                    
-                    if grid_y >= 0:
-                        self.grid[grid_y][grid_x] = piece['color']
-        
-        self.clear_lines()
-        self.current_piece = self.get_new_piece()
-        
-        if self.check_collision():
-            self.game_over = True
-    
-    def clear_lines(self):
-        lines_to_clear = []
-        
-        for y in range(GRID_HEIGHT):
-            if all(cell != BLACK for cell in self.grid[y]):
-                lines_to_clear.append(y)
+        _, cells = piece['shape'][piece['rotation']]
+        if y is None:
+            y = piece['y']
         
-        for y in lines_to_clear:
-            del self.grid[y]
-            self.grid.insert(0, [BLACK for _ in range(GRID_WIDTH)])
-            self.score += 100
-    
-    def rotate_piece(self):
-        piece = self.current_piece
-        new_rotation = (piece['rotation'] + 1) % len(piece['shape'])
-        
-        if not self.check_collision(rotation=new_rotation):
-            piece['rotation'] = new_rotation
-    
-    def move_piece(self, dx, dy):
-        if not self.check_collision(dx, dy):
-            self.current_piece['x'] += dx
-            self.current_piece['y'] += dy
-            return True
-        return False
-    
-    def drop_piece(self):
-        if not self.move_piece(0, 1):
-            self.lock_piece()
+        for dx, dy in cells:
+            rect = pygame.Rect(
+                GRID_X_OFFSET + (piece['x'] + dx) * CELL_SIZE,
+                GRID_Y_OFFSET + (y + dy) * CELL_SIZE,
+                CELL_SIZE,
+                CELL_SIZE
+            )
+            pygame.draw.rect(self.screen, piece['color'], rect, width)
+            if not width:
+                pygame.draw.rect(self.screen, GRAY, rect, 1)
+
+    def draw_ghost(self):
+        self.draw_piece(self.landing_y(), 2)
     
     def draw_info(self):
-        font = pygame.font.SysFont('Arial', 24)
-        score_text = font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (50, 50))
+        self.font.draw_number(self.screen, self.score, WHITE, prefix="Score: ", topleft=(50, 50))
+        self.font.draw_number(self.screen, self.level, WHITE, prefix="Level: ", topleft=(50, 90))
+
+        # Average time spent drawing a frame, in microseconds
+        if self.frame_times:
+            average = sum(self.frame_times) / len(self.frame_times)
+            mode = "Cached: " if self.use_field_cache else "Full: "
+            self.font.draw_number(self.screen, round(average * 1_000_000), GRAY,
+                                  prefix=mode, topleft=(50, SCREEN_HEIGHT - 50))
         
         if self.game_over:
-            game_over_text = font.render("GAME OVER", True, RED)
-            text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            self.screen.blit(game_over_text, text_rect)
+            self.font.draw(self.screen, "GAME OVER", RED, center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
     
+    def key_down(self, key):
+        if key == pygame.K_a:
+            self.autoplay = not self.autoplay
+            # Bot moves are not actions, so the game can no longer be replayed
+            self.events = None
+        elif key == pygame.K_f:
+            self.use_field_cache = not self.use_field_cache
+            self.frame_times = []
+        elif self.game_over:
+            if key == pygame.K_r:
+                self.__init__(das_ms=self.das_ms, arr_ms=self.arr_ms, record_path=self.record_path)
+        elif key in SHIFT_KEYS:
+            self.shifts.append(SHIFT_KEYS[key])
+            self.shift_delay = self.das_ms
+            if not self.autoplay:
+                self.act(SHIFT_KEYS[key])
+        elif not self.autoplay:
+            if key == pygame.K_DOWN:
+                self.soft_drop = True
+                self.gravity_time = 0
+                self.act(SOFT_DROP)
+            elif key == pygame.K_UP:
+                self.act(ROTATE)
+            elif key == pygame.K_SPACE:
+                self.act(HARD_DROP)
+
+    def key_up(self, key):
+        if key in SHIFT_KEYS:
+            direction = SHIFT_KEYS[key]
+            if direction in self.shifts:
+                self.shifts.remove(direction)
+            # Falling back to the other held direction restarts its delay
+            self.shift_delay = self.das_ms
+        elif key == pygame.K_DOWN:
+            self.soft_drop = False
+
+    def tick(self):
+        """Advance the game by one fixed timestep"""
+        self.ticks += 1
+
+        # Auto-shift while a direction is held
+        if self.shifts and not self.autoplay:
+            direction = self.shifts[-1]
+            self.shift_delay -= TICK_MS
+            while self.shift_delay <= 0:
+                if not self.act(direction):
+                    self.shift_delay = 0
+                    break
+                if self.arr_ms <= 0:
+                    continue
+                self.shift_delay += self.arr_ms
+
+        # Gravity; the remainder carries over so the fall rate does not drift
+        interval = gravity_interval(self.level)
+        if self.soft_drop and not self.autoplay:
+            interval = min(interval, SOFT_DROP_MS)
+        self.gravity_time += TICK_MS
+        while self.gravity_time >= interval and not self.game_over:
+            self.gravity_time -= interval
+            if self.autoplay:
+                self.ai.play_move(self)
+            else:
+                self.act(SOFT_DROP)
+
     def run(self):
-        fall_time = 0
-        fall_speed = 500  # milliseconds
-        
+        # Key events polled this frame, applied together just before the frame's last
+        # tick; they stay queued if no tick is due yet
+        inputs = deque()
+        sim_time = pygame.time.get_ticks()
+
         running = True
         while running:
-            dt = self.clock.tick(30)
-            fall_time += dt
-            
+            self.clock.tick(RENDER_FPS)
+
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-                elif event.type == pygame.KEYDOWN:
-                    if self.game_over:
-                        if event.key == pygame.K_r:
-                            self.__init__()
-                    else:
-                        if event.key == pygame.K_LEFT:
-                            self.move_piece(-1, 0)
-                        elif event.key == pygame.K_RIGHT:
-                            self.move_piece(1, 0)
-                        elif event.key == pygame.K_DOWN:
-                            self.drop_piece()
-                        elif event.key == pygame.K_UP:
-                            self.rotate_piece()
-                        elif event.key == pygame.K_SPACE:
-                            while self.move_piece(0, 1):
-                                pass
-                            self.lock_piece()
-            
-            if not self.game_over:
-                if fall_time >= fall_speed:
-                    self.drop_piece()
-                    fall_time = 0
+                elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                    inputs.append((event.type, event.key))
+
+            now = pygame.time.get_ticks()
+            sim_time = max(sim_time, now - MAX_CATCH_UP_MS)
+            while sim_time + TICK_MS <= now:
+                sim_time += TICK_MS
+                if sim_time + TICK_MS > now:
+                    while inputs:
+                        kind, key = inputs.popleft()
+                        if kind == pygame.KEYDOWN:
+                            self.key_down(key)
+                        else:
+                            self.key_up(key)
+                if not self.game_over:
+                    self.tick()
             
+            start = time.perf_counter()
             self.screen.fill(BLACK)
-            self.draw_grid()
+            if self.use_field_cache:
+                self.screen.blit(self.field, (GRID_X_OFFSET, GRID_Y_OFFSET))
+            else:
+                self.draw_grid()
+            if not self.game_over:
+                self.draw_ghost()
             self.draw_piece()
             self.draw_info()
+            self.frame_times.append(time.perf_counter() - start)
+            if len(self.frame_times) > FRAME_SAMPLES:
+                self.frame_times.pop(0)
             pygame.display.flip()
         
+        if not self.game_over:
+            self.save_replay()
         pygame.quit()
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play Tetris")
+    parser.add_argument("-s", "--seed", type=int, help="random seed (default: random)")
+    parser.add_argument("--record", metavar="FILE", help="save a replay of the latest game, see tetris_replay.py")
+    args = parser.parse_args(argv)
+
+    game = Tetris(args.seed, record_path=args.record)
+    game.run()
+
+
 if __name__ == "__main__":
     try:
-        game = Tetris()
-        game.run()
+        main()
     except Exception as e:
         print(f"Error: {e}")
         pygame.quit()
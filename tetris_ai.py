@@ -0,0 +1,237 @@
+import argparse
+import sys
+import time
+from collections import OrderedDict
+
+from tetris_board import WALL, column_heights, drop_row, rows_collide
+from tetris_pieces import BOTTOMS, KICKS, ROTATIONS
+from tetris_sim import GRID_HEIGHT, GRID_WIDTH, TetrisSim
+
+# Feature weights for the board evaluator (higher scores are better)
+FEATURE_WEIGHTS = {
+    "aggregate_height": -0.510066,
+    "lines": 0.760666,
+    "holes": -0.35663,
+    "bumpiness": -0.184483
+}
+
+# Most evaluated boards remembered by the transposition cache
+CACHE_SIZE = 100_000
+
+FIELD_MASK = ((1 << GRID_WIDTH) - 1) << WALL
+
+
+class TetrisAI:
+    """Placement-search bot for TetrisSim and Tetris
+
+    Every final placement reachable by moving and rotating the piece at its
+    spawn height and then dropping it is scored with a feature evaluator,
+    optionally looking one piece ahead. Evaluations of identical resulting
+    boards are shared through a bounded LRU cache.
+    """
+
+    def __init__(self, weights=None, lookahead=True, cache_size=CACHE_SIZE):
+        self.weights = dict(FEATURE_WEIGHTS, **(weights or {}))
+        self.lookahead = lookahead
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+
+        # Search statistics
+        self.placements = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.search_time = 0.0
+
+    @property
+    def stats(self):
+        """Search statistics accumulated since the bot was created"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'placements': self.placements,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_hit_rate': self.cache_hits / lookups if lookups else 0.0,
+            'cache_entries': len(self.cache),
+            'placements_per_sec': self.placements / self.search_time if self.search_time else 0.0
+        }
+
+    def placements_for(self, rows, wall_row, piece_type, x, y, rotation):
+        """Return {cells: (x, y, rotation)} for every distinct reachable landing spot"""
+        rotations = ROTATIONS[piece_type]
+        bottoms = BOTTOMS[piece_type]
+        kicks = KICKS[piece_type]
+        if rows_collide(rows, wall_row, rotations[rotation][0], x, y):
+            return {}
+        heights = column_heights(rows, GRID_WIDTH)
+        height = len(rows)
+
+        results = {}
+        seen = {(x, y, rotation)}
+        stack = [(x, y, rotation)]
+        while stack:
+            x, y, rotation = stack.pop()
+            row_masks, cells = rotations[rotation]
+
+            # Drop straight down from here, stepping only when under an overhang
+            landing = drop_row(heights, height, bottoms[rotation], x, y)
+            if landing is None:
+                landing = y
+                while not rows_collide(rows, wall_row, row_masks, x, landing + 1):
+                    landing += 1
+            key = frozenset((x + dx, landing + dy) for dx, dy in cells)
+            if key not in results:
+                results[key] = (x, landing, rotation)
+
+            # Shift left and right at the same height
+            for dx in (-1, 1):
+                state = (x + dx, y, rotation)
+                if state not in seen and not rows_collide(rows, wall_row, row_masks, x + dx, y):
+                    seen.add(state)
+                    stack.append(state)
+
+            # Rotate clockwise with the first wall kick that fits
+            new_rotation = (rotation + 1) % 4
+            new_masks = rotations[new_rotation][0]
+            for kx, ky in kicks[(rotation, new_rotation)]:
+                if not rows_collide(rows, wall_row, new_masks, x + kx, y + ky):
+                    state = (x + kx, y + ky, new_rotation)
+                    if state not in seen:
+                        seen.add(state)
+                        stack.append(state)
+                    break
+
+        return results
+
+    def place(self, rows, wall_row, full_row, piece_type, x, y, rotation):
+        """Lock a piece into a copy of rows; returns (new rows, lines cleared) or None on top-out"""
+        rows = list(rows)
+        shift = x + WALL
+        for dy, mask in ROTATIONS[piece_type][rotation][0]:
+            if y + dy < 0:
+                return None
+            rows[y + dy] |= mask << shift
+
+        kept = [row for row in rows if row != full_row]
+        lines = len(rows) - len(kept)
+        if lines:
+            rows = [wall_row] * lines + kept
+        return rows, lines
+
+    def evaluate(self, rows):
+        """Score a board without counting lines, using the transposition cache"""
+        key = tuple(rows)
+        value = self.cache.get(key)
+        if value is not None:
+            self.cache_hits += 1
+            self.cache.move_to_end(key)
+            return value
+        self.cache_misses += 1
+
+        heights = [0] * GRID_WIDTH
+        holes = 0
+        seen = 0
+        for y, row in enumerate(rows):
+            row &= FIELD_MASK
+            # Columns whose top block is in this row
+            new = row & ~seen
+            while new:
+                bit = new & -new
+                new ^= bit
+                heights[bit.bit_length() - 1 - WALL] = GRID_HEIGHT - y
+            holes += bin(seen & ~row).count('1')
+            seen |= row
+
+        bumpiness = sum(abs(heights[i] - heights[i + 1]) for i in range(GRID_WIDTH - 1))
+        weights = self.weights
+        value = (weights["aggregate_height"] * sum(heights) + weights["holes"] * holes +
+                 weights["bumpiness"] * bumpiness)
+
+        self.cache[key] = value
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return value
+
+    def best_placement(self, rows, wall_row, full_row, piece_type, x, y, rotation, next_type=None):
+        """Return (score, (x, y, rotation)) of the best placement, or (None, None) if there is none"""
+        best_score = None
+        best_move = None
+        spawn_x = GRID_WIDTH // 2 - 2
+
+        for move in self.placements_for(rows, wall_row, piece_type, x, y, rotation).values():
+            self.placements += 1
+            placed = self.place(rows, wall_row, full_row, piece_type, *move)
+            if placed is None:
+                continue
+            new_rows, lines = placed
+            score = self.weights["lines"] * lines
+
+            if next_type is None:
+                score += self.evaluate(new_rows)
+            else:
+                follow_up, _ = self.best_placement(new_rows, wall_row, full_row, next_type, spawn_x, 0, 0)
+                if follow_up is None:
+                    continue
+                score += follow_up
+
+            if best_score is None or score > best_score:
+                best_score = score
+                best_move = move
+
+        return best_score, best_move
+
+    def choose(self, sim):
+        """Pick the landing spot (x, y, rotation) for the current piece of a TetrisSim"""
+        start = time.perf_counter()
+        piece = sim.current_piece
+        next_type = sim.bag[-1] if self.lookahead and sim.bag else None
+        board = sim.board
+        _, move = self.best_placement(board.rows, board.wall_row, board.full_row, piece['type'],
+                                      piece['x'], piece['y'], piece['rotation'], next_type)
+        self.search_time += time.perf_counter() - start
+        return move
+
+    def play_move(self, sim):
+        """Place the current piece where the search says and lock it"""
+        move = self.choose(sim)
+        if move is None:
+            sim.hard_drop()
+            return
+        piece = sim.current_piece
+        piece['x'], piece['y'], piece['rotation'] = move
+        sim.lock_piece()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Let the placement-search bot play headless Tetris")
+    parser.add_argument("pieces", type=int, help="number of pieces to place")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--no-lookahead", action="store_true", help="only search the current piece")
+    args = parser.parse_args(argv)
+
+    ai = TetrisAI(lookahead=not args.no_lookahead)
+    sim = TetrisSim(args.seed)
+    games = 1
+    lines = 0
+    start = time.perf_counter()
+
+    for _ in range(args.pieces):
+        ai.play_move(sim)
+        if sim.game_over:
+            lines += sim.lines
+            sim = TetrisSim(args.seed + games)
+            games += 1
+    lines += sim.lines
+
+    elapsed = time.perf_counter() - start
+    stats = ai.stats
+    print(f"Placed {args.pieces} pieces in {games} games, clearing {lines} lines, in {elapsed:.2f}s")
+    print(f"Evaluated {stats['placements']} placements ({stats['placements_per_sec']:.0f}/sec), "
+          f"cache hit rate {stats['cache_hit_rate']:.1%} with {stats['cache_entries']} entries")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
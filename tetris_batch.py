@@ -0,0 +1,238 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from tetris_pieces import KICKS, ROTATIONS, SHAPES
+from tetris_sim import ACTIONS, GRID_HEIGHT, GRID_WIDTH, HARD_DROP, LEFT, LINE_SCORES, RIGHT, ROTATE
+
+# OFFSETS[piece, rotation, cell] = (dx, dy) of each of the 4 squares
+OFFSETS = np.array([[cells for _, cells in rotations] for rotations in ROTATIONS], dtype=np.int16)
+
+# CW_KICKS[piece, rotation, kick] = (dx, dy) tried when rotating clockwise from rotation,
+# padded with (0, 0) for pieces with fewer kicks
+MAX_KICKS = max(len(kicks) for table in KICKS for kicks in table.values())
+CW_KICKS = np.zeros((len(SHAPES), 4, MAX_KICKS, 2), dtype=np.int16)
+for piece, table in enumerate(KICKS):
+    for rotation in range(4):
+        kicks = table[(rotation, (rotation + 1) % 4)]
+        CW_KICKS[piece, rotation, :len(kicks)] = kicks
+
+LINE_SCORE_TABLE = np.array(LINE_SCORES, dtype=np.int64)
+
+SPAWN_X = GRID_WIDTH // 2 - 2
+
+
+class TetrisBatchEnv:
+    """N Tetris games stepped in lockstep on NumPy arrays
+
+    Follows the TetrisSim rules: a 7-bag per board, SRS rotation with wall
+    kicks, one row of gravity per step and the LINE_SCORES table. Boards that
+    top out are reset automatically.
+    """
+
+    def __init__(self, num_envs, seed=None):
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+        self.index = np.arange(num_envs)
+
+        self.grid = np.zeros((num_envs, GRID_HEIGHT, GRID_WIDTH), dtype=bool)
+        self.piece = np.zeros(num_envs, dtype=np.int16)
+        self.x = np.zeros(num_envs, dtype=np.int16)
+        self.y = np.zeros(num_envs, dtype=np.int16)
+        self.rotation = np.zeros(num_envs, dtype=np.int16)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        # Final score of the last finished game on each board
+        self.last_score = np.zeros(num_envs, dtype=np.int64)
+
+        self.bags = np.tile(np.arange(len(SHAPES), dtype=np.int16), (num_envs, 1))
+        self.bag_pos = np.full(num_envs, len(SHAPES))
+
+        self.spawn(np.ones(num_envs, dtype=bool))
+
+    def deal(self, mask):
+        """Next piece type from each masked board's bag, refilling empty bags"""
+        refill = mask & (self.bag_pos >= len(SHAPES))
+        if refill.any():
+            self.bags[refill] = self.rng.permuted(self.bags[refill], axis=1)
+            self.bag_pos[refill] = 0
+        pieces = self.bags[self.index, np.minimum(self.bag_pos, len(SHAPES) - 1)]
+        self.bag_pos[mask] += 1
+        return pieces
+
+    def spawn(self, mask):
+        """Give the masked boards a new piece; returns the boards that topped out"""
+        self.piece = np.where(mask, self.deal(mask), self.piece)
+        self.x[mask] = SPAWN_X
+        self.y[mask] = 0
+        self.rotation[mask] = 0
+        return mask & self.collides(self.x, self.y, self.rotation)
+
+    def cells(self, x, y, rotation, boards=None):
+        """Board coordinates of the 4 piece squares, shape (N, 4), or (len(boards), 4) for a subset"""
+        piece = self.piece if boards is None else self.piece[boards]
+        offsets = OFFSETS[piece, rotation]
+        return x[:, None] + offsets[:, :, 0], y[:, None] + offsets[:, :, 1]
+
+    def collides(self, x, y, rotation, boards=None):
+        """Per-board collision of the current piece at (x, y, rotation)
+
+        With boards given, x, y and rotation are for just those boards.
+        """
+        if boards is None:
+            boards = self.index
+        cx, cy = self.cells(x, y, rotation, boards)
+        outside = (cx < 0) | (cx >= GRID_WIDTH) | (cy >= GRID_HEIGHT)
+        # Squares above the top only collide with the side walls
+        inside = ~outside & (cy >= 0)
+        filled = self.grid[boards[:, None], np.clip(cy, 0, GRID_HEIGHT - 1),
+                           np.clip(cx, 0, GRID_WIDTH - 1)]
+        return (outside | (filled & inside)).any(axis=1)
+
+    def hard_drop(self, mask):
+        """Move masked pieces straight down to where they land
+
+        Like drop_row in tetris_board: a piece above the surface of every
+        column it covers lands at the lowest of (column top - 1 - square's
+        dy), computed for all boards at once. Pieces tucked under an
+        overhang step down, testing collisions only on those boards.
+        """
+        boards = np.flatnonzero(mask)
+        if not len(boards):
+            return
+        grids = self.grid[boards]
+        tops = np.where(grids.any(axis=1), grids.argmax(axis=1), GRID_HEIGHT)
+
+        x = self.x[boards]
+        y = self.y[boards]
+        rotation = self.rotation[boards]
+        offsets = OFFSETS[self.piece[boards], rotation]
+        columns = x[:, None] + offsets[:, :, 0]
+        landing = (tops[np.arange(len(boards))[:, None], columns] - 1 - offsets[:, :, 1]).min(axis=1)
+
+        direct = landing >= y
+        self.y[boards[direct]] = landing[direct]
+
+        boards = boards[~direct]
+        while len(boards):
+            y = self.y[boards] + 1
+            fits = ~self.collides(self.x[boards], y, self.rotation[boards], boards)
+            boards = boards[fits]
+            self.y[boards] = y[fits]
+
+    def try_move(self, mask, dx, dy):
+        """Shift masked pieces where they fit; returns the boards that moved"""
+        boards = np.flatnonzero(mask)
+        x = self.x[boards] + dx
+        y = self.y[boards] + dy
+        fits = ~self.collides(x, y, self.rotation[boards], boards)
+        moved_boards = boards[fits]
+        self.x[moved_boards] = x[fits]
+        self.y[moved_boards] = y[fits]
+        moved = np.zeros(self.num_envs, dtype=bool)
+        moved[moved_boards] = True
+        return moved
+
+    def try_rotate(self, mask):
+        """Rotate masked pieces clockwise, trying each wall kick in order"""
+        boards = np.flatnonzero(mask)
+        for kick in range(MAX_KICKS):
+            if not len(boards):
+                break
+            rotation = self.rotation[boards]
+            dx, dy = CW_KICKS[self.piece[boards], rotation, kick].T
+            x = self.x[boards] + dx
+            y = self.y[boards] + dy
+            new_rotation = (rotation + 1) % 4
+            fits = ~self.collides(x, y, new_rotation, boards)
+            turned = boards[fits]
+            self.x[turned] = x[fits]
+            self.y[turned] = y[fits]
+            self.rotation[turned] = new_rotation[fits]
+            boards = boards[~fits]
+
+    def lock(self, mask):
+        """Write masked pieces into the grid, clear lines and return the points scored"""
+        cx, cy = self.cells(self.x, self.y, self.rotation)
+        visible = mask[:, None] & (cy >= 0)
+        boards = np.broadcast_to(self.index[:, None], cx.shape)
+        self.grid[boards[visible], cy[visible], cx[visible]] = True
+
+        full = self.grid.all(axis=2) & mask[:, None]
+        lines = full.sum(axis=1)
+        cleared = lines > 0
+        if cleared.any():
+            # Stable sort puts full rows first and keeps the others in order;
+            # the full rows are then emptied, which drops everything above them
+            order = np.argsort(~full[cleared], axis=1, kind='stable')
+            grids = np.take_along_axis(self.grid[cleared], order[:, :, None], axis=1)
+            grids[np.arange(GRID_HEIGHT) < lines[cleared][:, None]] = False
+            self.grid[cleared] = grids
+        return LINE_SCORE_TABLE[lines]
+
+    def reset(self, mask):
+        """Start new games on the masked boards"""
+        self.last_score[mask] = self.score[mask]
+        self.grid[mask] = False
+        self.score[mask] = 0
+        self.spawn(mask)
+
+    def observe(self):
+        """Grids as uint8 with locked squares = 1 and the falling piece = 2"""
+        obs = self.grid.astype(np.uint8)
+        cx, cy = self.cells(self.x, self.y, self.rotation)
+        visible = cy >= 0
+        boards = np.broadcast_to(self.index[:, None], cx.shape)
+        obs[boards[visible], cy[visible], cx[visible]] = 2
+        return obs
+
+    def step(self, actions):
+        """Apply one action per board plus gravity; returns (obs, rewards, dones)"""
+        actions = np.asarray(actions)
+        self.try_move(actions == LEFT, -1, 0)
+        self.try_move(actions == RIGHT, 1, 0)
+        self.try_rotate(actions == ROTATE)
+
+        # Hard drops fall until they land, everything else falls one row
+        self.hard_drop(actions == HARD_DROP)
+        falling = actions != HARD_DROP
+        landed = ~self.try_move(falling, 0, 1)
+
+        rewards = self.lock(landed)
+        self.score += rewards
+        dones = self.spawn(landed)
+        if dones.any():
+            self.reset(dones)
+
+        return self.observe(), rewards, dones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the batched Tetris environment with random play")
+    parser.add_argument("steps", type=int, help="number of batched steps")
+    parser.add_argument("-n", "--num-envs", type=int, default=1024, help="boards stepped together")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+
+    env = TetrisBatchEnv(args.num_envs, args.seed)
+    rng = np.random.default_rng(args.seed)
+    games = 0
+    start = time.perf_counter()
+
+    for _ in range(args.steps):
+        _, _, dones = env.step(rng.choice(ACTIONS, size=args.num_envs))
+        games += int(dones.sum())
+
+    elapsed = time.perf_counter() - start
+    total = args.steps * args.num_envs
+    print(f"Simulated {total} board steps ({games} finished games) in {elapsed:.2f}s "
+          f"({total / elapsed:.0f} board steps/sec)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
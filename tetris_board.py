@@ -0,0 +1,129 @@
+# Wall bits kept on each side of a row so pieces can be shifted past the edges
+WALL = 4
+
+
+def rows_collide(rows, wall_row, row_masks, x, y):
+    """Collision test against any list of bitboard rows, such as a what-if copy"""
+    shift = x + WALL
+    if shift < 0:
+        return True
+
+    height = len(rows)
+    for dy, mask in row_masks:
+        row_y = y + dy
+        if row_y >= height:
+            return True
+        # Rows above the top only have walls
+        row = rows[row_y] if row_y >= 0 else wall_row
+        if row & (mask << shift):
+            return True
+    return False
+
+
+def column_heights(rows, width):
+    """Height of the highest block in each column, counted up from the floor"""
+    field = ((1 << width) - 1) << WALL
+    heights = [0] * width
+    height = len(rows)
+    seen = 0
+    for y, row in enumerate(rows):
+        # Columns whose top block is in this row
+        new = row & field & ~seen
+        while new:
+            bit = new & -new
+            new ^= bit
+            heights[bit.bit_length() - 1 - WALL] = height - y
+        seen |= row
+        if seen & field == field:
+            break
+    return heights
+
+
+def drop_row(heights, height, bottoms, x, y):
+    """Landing row of a piece dropped from (x, y), or None if it starts below the surface
+
+    Everything above a column's height is empty, so a piece that starts
+    above the surface in all its columns falls until one of its bottom
+    cells rests on a column top.
+    """
+    landing = min(height - heights[x + dx] - 1 - dy for dx, dy in bottoms)
+    return landing if landing >= y else None
+
+
+class Playfield:
+    """Bitboard playfield: one integer per row plus a color layer for rendering
+
+    Bit WALL + x of a row is set when column x is filled. The WALL bits on
+    either side are always set, so a row is full exactly when it equals
+    full_row and a piece hits a side wall with the same AND as a block.
+    """
+
+    def __init__(self, width, height, empty_color):
+        self.width = width
+        self.height = height
+        self.empty_color = empty_color
+        wall = (1 << WALL) - 1
+        self.wall_row = wall | (wall << (WALL + width))
+        self.full_row = (1 << (width + 2 * WALL)) - 1
+        self.rows = [self.wall_row] * height
+        self.colors = [[empty_color for _ in range(width)] for _ in range(height)]
+        # Per-column surface heights, kept up to date by lock and clear_full_rows
+        self.heights = [0] * width
+
+    def collides(self, row_masks, x, y):
+        """Check if a piece with these row masks overlaps walls, floor or blocks at (x, y)"""
+        return rows_collide(self.rows, self.wall_row, row_masks, x, y)
+
+    def landing_y(self, row_masks, bottoms, x, y):
+        """Row a piece at (x, y) comes to rest at when dropped straight down"""
+        landing = drop_row(self.heights, self.height, bottoms, x, y)
+        if landing is not None:
+            return landing
+
+        # Tucked under an overhang: step down until something is hit
+        while not self.collides(row_masks, x, y + 1):
+            y += 1
+        return y
+
+    def lock(self, row_masks, cells, x, y, color):
+        """Write a piece into the bitboard and the color layer"""
+        shift = x + WALL
+        for dy, mask in row_masks:
+            if y + dy >= 0:
+                self.rows[y + dy] |= mask << shift
+        heights = self.heights
+        for dx, dy in cells:
+            if y + dy >= 0:
+                self.colors[y + dy][x + dx] = color
+                heights[x + dx] = max(heights[x + dx], self.height - y - dy)
+
+    def clear_full_rows(self):
+        """Drop every full row in one bottom-up pass and return how many were cleared"""
+        rows = self.rows
+        colors = self.colors
+        full_row = self.full_row
+        cleared = []
+
+        # Slide each kept row down to the next free slot from the bottom
+        write = self.height - 1
+        for read in range(self.height - 1, -1, -1):
+            if rows[read] == full_row:
+                cleared.append(colors[read])
+            else:
+                if write != read:
+                    rows[write] = rows[read]
+                    colors[write] = colors[read]
+                write -= 1
+
+        # Blank the cleared color rows and reuse them as the new top rows
+        empty_color = self.empty_color
+        for y, color_row in enumerate(cleared):
+            for x in range(self.width):
+                color_row[x] = empty_color
+            rows[y] = self.wall_row
+            colors[y] = color_row
+
+        # A cleared row can uncover holes, so rescan the column tops
+        if cleared:
+            self.heights = column_heights(rows, self.width)
+        return len(cleared)
@@ -0,0 +1,128 @@
+# Tetromino tables, compiled once at import.
+#
+# Each piece is given in its spawn orientation inside its SRS bounding box
+# (4x4 for I, 3x3 for the others). The other three rotation states are
+# derived by rotating clockwise inside that box; O keeps its spawn state.
+
+PIECE_NAMES = ['I', 'O', 'T', 'S', 'Z', 'J', 'L']
+
+# Colors for each piece
+CYAN = (0, 255, 255)
+YELLOW = (255, 255, 0)
+PURPLE = (128, 0, 128)
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+ORANGE = (255, 165, 0)
+SHAPE_COLORS = [CYAN, YELLOW, PURPLE, GREEN, RED, BLUE, ORANGE]
+
+SHAPES = [
+    # I-piece
+    ['....',
+     '####',
+     '....',
+     '....'],
+
+    # O-piece (never rotates)
+    ['.##.',
+     '.##.'],
+
+    # T-piece
+    ['.#.',
+     '###',
+     '...'],
+
+    # S-piece
+    ['.##',
+     '##.',
+     '...'],
+
+    # Z-piece
+    ['##.',
+     '.##',
+     '...'],
+
+    # J-piece
+    ['#..',
+     '###',
+     '...'],
+
+    # L-piece
+    ['..#',
+     '###',
+     '...']
+]
+
+# SRS wall kicks as (dx, dy) with y pointing down, tried in order.
+# Keys are (from rotation, to rotation); 0 = spawn, 1 = R, 2 = 180, 3 = L.
+JLSTZ_KICKS = {
+    (0, 1): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (1, 0): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (1, 2): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (2, 1): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (2, 3): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (3, 2): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (3, 0): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (0, 3): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2))
+}
+
+I_KICKS = {
+    (0, 1): ((0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)),
+    (1, 0): ((0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)),
+    (1, 2): ((0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1)),
+    (2, 1): ((0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)),
+    (2, 3): ((0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)),
+    (3, 2): ((0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)),
+    (3, 0): ((0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)),
+    (0, 3): ((0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1))
+}
+
+O_KICKS = {key: ((0, 0),) for key in JLSTZ_KICKS}
+
+
+def template_cells(template):
+    """(dx, dy) offsets of the '#' squares in a template"""
+    return tuple((dx, dy) for dy, row in enumerate(template) for dx, cell in enumerate(row) if cell == '#')
+
+
+def rotate_cells(cells, size):
+    """Rotate cell offsets clockwise inside a size x size box"""
+    return tuple((size - 1 - dy, dx) for dx, dy in cells)
+
+
+def row_masks(cells):
+    """Group cells into (dy, bitmask of dx) pairs for the bitboard"""
+    masks = {}
+    for dx, dy in cells:
+        masks[dy] = masks.get(dy, 0) | (1 << dx)
+    return tuple(sorted(masks.items()))
+
+
+def bottom_profile(cells):
+    """(dx, lowest dy) for each column a piece covers"""
+    bottoms = {}
+    for dx, dy in cells:
+        bottoms[dx] = max(bottoms.get(dx, dy), dy)
+    return tuple(sorted(bottoms.items()))
+
+
+def compile_piece(template, rotates=True):
+    """Return the four (row masks, cells) rotation states of a piece"""
+    size = len(template)
+    cells = template_cells(template)
+    rotations = []
+    for _ in range(4):
+        rotations.append((row_masks(cells), cells))
+        if rotates:
+            cells = rotate_cells(cells, size)
+    return tuple(rotations)
+
+
+# ROTATIONS[piece][rotation] = (row masks, cells)
+ROTATIONS = tuple(compile_piece(template, name != 'O') for name, template in zip(PIECE_NAMES, SHAPES))
+
+# BOTTOMS[piece][rotation] = bottom profile, for landing rows from column heights
+BOTTOMS = tuple(tuple(bottom_profile(cells) for _, cells in rotations) for rotations in ROTATIONS)
+
+# KICKS[piece][(from rotation, to rotation)] = kick offsets to try
+KICKS = tuple(I_KICKS if name == 'I' else O_KICKS if name == 'O' else JLSTZ_KICKS for name in PIECE_NAMES)
@@ -0,0 +1,132 @@
+import argparse
+import hashlib
+import struct
+import sys
+import time
+
+from tetris_sim import ACTIONS, TetrisSim
+
+# Replay file layout:
+#   header: magic, version, seed, number of events, final score, final state hash
+#   events: one unsigned LEB128 varint per event holding
+#           (ticks since the previous event << ACTION_BITS) | action
+MAGIC = b"TETRISRP"
+VERSION = 1
+HASH_SIZE = 16
+HEADER = struct.Struct(f"<8sHqII{HASH_SIZE}s")
+ACTION_BITS = 3
+ACTION_MASK = (1 << ACTION_BITS) - 1
+
+
+def state_hash(game):
+    """Digest of the grid, current piece and score of a TetrisSim or Tetris"""
+    piece = game.current_piece
+    state = (game.grid, piece['type'], piece['x'], piece['y'], piece['rotation'], piece['color'],
+             game.score, game.game_over)
+    return hashlib.blake2b(repr(state).encode("ascii"), digest_size=HASH_SIZE).digest()
+
+
+def encode_events(events):
+    """Pack (tick, action) pairs as delta-encoded varints"""
+    data = bytearray()
+    last_tick = 0
+    for tick, action in events:
+        value = ((tick - last_tick) << ACTION_BITS) | action
+        last_tick = tick
+        while value >= 0x80:
+            data.append((value & 0x7F) | 0x80)
+            value >>= 7
+        data.append(value)
+    return bytes(data)
+
+
+def decode_events(data, count):
+    """Unpack count (tick, action) pairs from delta-encoded varints"""
+    events = []
+    tick = 0
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        tick += value >> ACTION_BITS
+        events.append((tick, value & ACTION_MASK))
+        value = 0
+        shift = 0
+
+    if len(events) != count or shift:
+        raise ValueError("Truncated replay event stream")
+    return events
+
+
+def write_replay(path, seed, events, game):
+    """Save a game's seed and (tick, action) events, with its final state for checking"""
+    with open(path, "wb") as replay:
+        replay.write(HEADER.pack(MAGIC, VERSION, seed, len(events), game.score, state_hash(game)))
+        replay.write(encode_events(events))
+
+
+def read_replay(path):
+    """Load a replay as (seed, events, final score, final state hash)"""
+    with open(path, "rb") as replay:
+        data = replay.read()
+
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a Tetris replay")
+    magic, version, seed, count, score, final_hash = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a supported Tetris replay")
+
+    return seed, decode_events(data[HEADER.size:], count), score, final_hash
+
+
+def play_replay(seed, events):
+    """Re-simulate a replay headlessly as fast as possible and return the finished sim
+
+    Gravity, auto-shift and soft drop were all recorded as actions, so
+    playback applies them in order without any timing.
+    """
+    sim = TetrisSim(seed, gravity_every=0)
+    apply_action = sim.apply_action
+    for _, action in events:
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown replay action {action}")
+        apply_action(action)
+    return sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-simulate Tetris replays and check their final state")
+    parser.add_argument("replays", nargs="+", help="replay files recorded with tetris.py --record")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="times to play each replay, for benchmarking")
+    args = parser.parse_args(argv)
+
+    mismatches = 0
+    for path in args.replays:
+        seed, events, score, final_hash = read_replay(path)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            sim = play_replay(seed, events)
+        elapsed = time.perf_counter() - start
+
+        ticks = events[-1][0] if events else 0
+        verified = state_hash(sim) == final_hash and sim.score == score
+        if not verified:
+            mismatches += 1
+        rate = len(events) * args.repeat / elapsed if elapsed else 0
+        print(f"{path}: {'OK' if verified else 'MISMATCH'}, {len(events)} actions over {ticks} ticks, "
+              f"score {sim.score}, {rate:.0f} actions/sec")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
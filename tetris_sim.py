@@ -0,0 +1,202 @@
+import argparse
+import random
+import sys
+import time
+
+from tetris_board import Playfield
+from tetris_pieces import BOTTOMS, KICKS, ROTATIONS, SHAPE_COLORS, SHAPES
+
+# Playfield size
+GRID_WIDTH = 10
+GRID_HEIGHT = 20
+
+# Color of an empty cell in the color layer
+EMPTY_COLOR = (0, 0, 0)
+
+# Cleared lines needed to go up one level
+LINES_PER_LEVEL = 10
+
+# Points for clearing 0-4 lines with one piece, rewarding multi-line clears
+LINE_SCORES = (0, 100, 300, 500, 800)
+
+# Actions accepted by TetrisSim.step
+NOOP = 0
+LEFT = 1
+RIGHT = 2
+ROTATE = 3
+SOFT_DROP = 4
+HARD_DROP = 5
+ACTIONS = (NOOP, LEFT, RIGHT, ROTATE, SOFT_DROP, HARD_DROP)
+
+
+class TetrisSim:
+    """Tetris rules with no display, driven by a seeded RNG
+
+    Pieces come from a 7-bag randomizer, so the same seed and the same
+    actions always give the same game.
+    """
+
+    def __init__(self, seed=None, gravity_every=1):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.bag = []
+        # step() applies one row of gravity every gravity_every steps (0 = never)
+        self.gravity_every = gravity_every
+        self.steps = 0
+
+        # Bitboard used for collisions; grid is its color layer, used for drawing
+        self.board = Playfield(GRID_WIDTH, GRID_HEIGHT, EMPTY_COLOR)
+        self.grid = self.board.colors
+        self.current_piece = self.get_new_piece()
+        self.game_over = False
+        self.score = 0
+        self.lines = 0
+
+    @property
+    def level(self):
+        """Current level, starting at 1"""
+        return self.lines // LINES_PER_LEVEL + 1
+
+    def next_piece_type(self):
+        """Deal the next piece from a shuffled bag of all seven"""
+        if not self.bag:
+            self.bag = list(range(len(SHAPES)))
+            self.rng.shuffle(self.bag)
+        return self.bag.pop()
+
+    def get_new_piece(self):
+        index = self.next_piece_type()
+        color = self.rng.choice(SHAPE_COLORS)
+        return {
+            'type': index,
+            'shape': ROTATIONS[index],
+            'color': color,
+            'x': GRID_WIDTH // 2 - 2,
+            'y': 0,
+            'rotation': 0
+        }
+
+    def check_collision(self, dx=0, dy=0, rotation=None):
+        piece = self.current_piece
+        if rotation is None:
+            rotation = piece['rotation']
+
+        row_masks, _ = piece['shape'][rotation]
+        return self.board.collides(row_masks, piece['x'] + dx, piece['y'] + dy)
+
+    def lock_piece(self):
+        piece = self.current_piece
+        row_masks, cells = piece['shape'][piece['rotation']]
+        self.board.lock(row_masks, cells, piece['x'], piece['y'], piece['color'])
+
+        self.clear_lines()
+        self.current_piece = self.get_new_piece()
+
+        if self.check_collision():
+            self.game_over = True
+
+    def clear_lines(self):
+        lines = self.board.clear_full_rows()
+        self.score += LINE_SCORES[lines]
+        self.lines += lines
+
+    def rotate_piece(self):
+        piece = self.current_piece
+        new_rotation = (piece['rotation'] + 1) % len(piece['shape'])
+
+        # Try each SRS wall kick in turn
+        for dx, dy in KICKS[piece['type']][(piece['rotation'], new_rotation)]:
+            if not self.check_collision(dx, dy, new_rotation):
+                piece['x'] += dx
+                piece['y'] += dy
+                piece['rotation'] = new_rotation
+                return True
+        return False
+
+    def move_piece(self, dx, dy):
+        if not self.check_collision(dx, dy):
+            self.current_piece['x'] += dx
+            self.current_piece['y'] += dy
+            return True
+        return False
+
+    def drop_piece(self):
+        if not self.move_piece(0, 1):
+            self.lock_piece()
+
+    def landing_y(self):
+        """Row the current piece would lock at if dropped straight down"""
+        piece = self.current_piece
+        rotation = piece['rotation']
+        row_masks, _ = piece['shape'][rotation]
+        return self.board.landing_y(row_masks, BOTTOMS[piece['type']][rotation], piece['x'], piece['y'])
+
+    def hard_drop(self):
+        self.current_piece['y'] = self.landing_y()
+        self.lock_piece()
+
+    def get_state(self):
+        """Compact snapshot: (board rows, piece type, x, y, rotation)"""
+        piece = self.current_piece
+        return (tuple(self.board.rows), piece['type'], piece['x'], piece['y'], piece['rotation'])
+
+    def apply_action(self, action):
+        """Apply one action without gravity; returns False if it changed nothing"""
+        if action == LEFT:
+            return self.move_piece(-1, 0)
+        elif action == RIGHT:
+            return self.move_piece(1, 0)
+        elif action == ROTATE:
+            return self.rotate_piece()
+        elif action == SOFT_DROP:
+            self.drop_piece()
+        elif action == HARD_DROP:
+            self.hard_drop()
+        else:
+            return False
+        return True
+
+    def step(self, action):
+        """Apply one action plus gravity and return (state, reward, done)"""
+        if self.game_over:
+            return self.get_state(), 0, True
+
+        score = self.score
+        self.apply_action(action)
+
+        self.steps += 1
+        if (self.gravity_every and self.steps % self.gravity_every == 0 and
+                action not in (SOFT_DROP, HARD_DROP) and not self.game_over):
+            self.drop_piece()
+
+        return self.get_state(), self.score - score, self.game_over
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the headless Tetris simulation with random play")
+    parser.add_argument("steps", type=int, help="number of steps to simulate")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+
+    actions = random.Random(args.seed)
+    sim = TetrisSim(args.seed)
+    games = 1
+    start = time.perf_counter()
+
+    for _ in range(args.steps):
+        _, _, done = sim.step(actions.choice(ACTIONS))
+        if done:
+            sim = TetrisSim(actions.getrandbits(32))
+            games += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"Simulated {args.steps} steps over {games} games in {elapsed:.2f}s "
+          f"({args.steps / elapsed:.0f} steps/sec)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
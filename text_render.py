@@ -0,0 +1,70 @@
+import pygame
+from collections import OrderedDict
+
+# Most rendered strings kept before the least recently used one is dropped
+MAX_GLYPHS = 512
+
+# Loaded fonts keyed by (name, size), shared by every TextRenderer
+_fonts = {}
+
+# Rendered surfaces keyed by (name, size, text, color), oldest first
+_glyphs = OrderedDict()
+
+
+def get_font(name, size):
+    """Load a system font once and reuse it"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextRenderer:
+    """Draws text from pre-rendered surfaces cached per (font, size, color)
+
+    Numbers are composed from cached digit glyphs, so a changing score only
+    ever renders the ten digits once per color.
+    """
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.font = get_font(name, size)
+
+    def render(self, text, color):
+        """Return the cached surface for text, rendering it on first use"""
+        key = (self.name, self.size, text, color)
+        glyph = _glyphs.get(key)
+        if glyph is None:
+            glyph = self.font.render(text, True, color)
+            _glyphs[key] = glyph
+            if len(_glyphs) > MAX_GLYPHS:
+                _glyphs.popitem(last=False)
+        else:
+            _glyphs.move_to_end(key)
+        return glyph
+
+    def draw(self, surface, text, color, **position):
+        """Blit text positioned like Surface.get_rect(**position) and return its rect"""
+        glyph = self.render(text, color)
+        rect = glyph.get_rect(**position)
+        surface.blit(glyph, rect)
+        return rect
+
+    def draw_number(self, surface, value, color, prefix="", **position):
+        """Blit prefix followed by value, built from per-digit glyphs"""
+        pieces = [self.render(prefix, color)] if prefix else []
+        pieces.extend(self.render(digit, color) for digit in str(value))
+
+        rect = pygame.Rect(0, 0, sum(piece.get_width() for piece in pieces),
+                           max(piece.get_height() for piece in pieces))
+        for attribute, point in position.items():
+            setattr(rect, attribute, point)
+
+        x = rect.x
+        for piece in pieces:
+            surface.blit(piece, (x, rect.y))
+            x += piece.get_width()
+        return rect